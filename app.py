@@ -1,10 +1,15 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, date
 import time
+import os
+import logging
+import io
 
 # Module Imports
 from modules.database_setup import init_db
+from modules import metrics
+from modules.metrics import section
+from modules.assets import asset_src, get_text_asset
 from modules.auth import (
     render_auth, 
     get_user_settings, 
@@ -14,12 +19,14 @@ from modules.auth import (
 from modules.calendar_logic import (
     save_cycle, 
     get_user_cycles, 
+    get_cycle_stats,
     predict_next_period, 
-    render_monthly_calendar,
     render_cycle_chart
 )
+from modules.cycle_io import import_cycles, export_cycles_text, detect_format
 from modules.health_data import render_water_tracker, render_exercise_guide
-from modules.translations import translations
+from modules.water_log import flush as flush_water_log
+from modules.translations import LANG_NAMES, get_translations
 
 # Page Config
 st.set_page_config(
@@ -28,12 +35,36 @@ st.set_page_config(
     layout="centered",
     initial_sidebar_state="collapsed"
 )
-# Initialize DB
-init_db()
+logger = logging.getLogger(__name__)
+
+# Initialize DB once per server process; Streamlit re-executes this module on
+# every interaction, but cache_resource runs the body only on the first call.
+@st.cache_resource(show_spinner=False)
+def startup():
+    start = time.perf_counter()
+    schema_version = init_db()
+    report = {"init_ms": (time.perf_counter() - start) * 1000, "schema_version": schema_version}
+    logger.info("database ready: schema v%d in %.1f ms", report["schema_version"], report["init_ms"])
+    if metrics.ENABLED and metrics.start_server():
+        logger.info("metrics on port %d (/metrics, /metrics.json)", metrics.METRICS_PORT)
+    return report
+
+startup()
+
+# Splash screen: "off", "first_visit" (once per browser tab, survives refresh)
+# or "always" (every new session)
+SPLASH_MODES = ("off", "first_visit", "always")
+SPLASH_MODE = os.environ.get("MAHWARI_SPLASH", "first_visit")
+SPLASH_SECONDS = 5
+
+# Dashboard navigation: "lazy" renders only the selected view (a radio keyed
+# "nav"), "tabs" renders every view inside st.tabs on each rerun
+NAV_MODES = ("lazy", "tabs")
+NAV_MODE = os.environ.get("MAHWARI_NAV", "lazy")
+VIEWS = ("log", "dash", "health")
 
 def load_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+    st.markdown(f'<style>{get_text_asset(file_name)}</style>', unsafe_allow_html=True)
 
 def inject_custom_css(hue):
     # Dynamic Hue Injection
@@ -48,79 +79,218 @@ def inject_custom_css(hue):
     """
     st.markdown(css, unsafe_allow_html=True)
 
+def render_splash():
+    # Played and dismissed entirely in the browser (CSS fade after
+    # SPLASH_SECONDS) while the script keeps rendering the page underneath.
+    if "has_loaded" in st.session_state:
+        return
+    st.session_state["has_loaded"] = True
+    st.session_state["splash_shown"] = False
+
+    mode = SPLASH_MODE if SPLASH_MODE in SPLASH_MODES else "first_visit"
+    if mode == "off":
+        return
+    if mode == "first_visit":
+        if st.query_params.get("splash") == "seen":
+            return
+        st.query_params["splash"] = "seen"
+
+    loading_video = asset_src("static/loading.mp4")
+    if not loading_video:
+        return
+    st.markdown(f"""
+    <style>
+        .splash {{
+            position: fixed; top: 0; left: 0; width: 100vw; height: 100vh;
+            background: black; z-index: 1000000;
+            display: flex; align-items: center; justify-content: center;
+            animation: splash-out 0.5s ease {SPLASH_SECONDS}s forwards;
+        }}
+        @keyframes splash-out {{
+            to {{ opacity: 0; visibility: hidden; pointer-events: none; }}
+        }}
+    </style>
+    <div class="splash">
+        <video autoplay muted playsinline style="width: 100%; height: 100%; object-fit: cover;">
+            <source src="{loading_video}" type="video/mp4">
+        </video>
+    </div>
+    """, unsafe_allow_html=True)
+    st.session_state["splash_shown"] = True
+
+def record_time_to_interactive():
+    # Server-side timings for a new session's first full render. first_render_ms
+    # is measured; tti_ms is when the page can be used, i.e. no earlier than
+    # the splash fading out. The measured render also goes to the metrics
+    # registry per splash mode (first_render_<mode>) for comparison.
+    if "tti_ms" in st.session_state or "session_start" not in st.session_state:
+        return
+    mode = SPLASH_MODE if SPLASH_MODE in SPLASH_MODES else "first_visit"
+    render_ms = (time.perf_counter() - st.session_state["session_start"]) * 1000
+    splash_ms = SPLASH_SECONDS * 1000 if st.session_state.get("splash_shown") else 0
+    st.session_state["first_render_ms"] = render_ms
+    st.session_state["tti_ms"] = max(render_ms, splash_ms)
+    if metrics.ENABLED:
+        metrics.record(f"first_render_{mode}", render_ms)
+    logger.info(
+        "first render %.0f ms, time to first interactive %.0f ms (splash=%s, shown=%s)",
+        render_ms, st.session_state["tti_ms"], mode, bool(splash_ms)
+    )
+
+def render_background_video():
+    bg_video = asset_src("static/background.mp4")
+    if not bg_video:
+        return
+    st.markdown(f"""
+    <style>
+        .stApp {{
+            background: transparent;
+        }}
+        .video-bg {{
+            position: fixed;
+            right: 0;
+            bottom: 0;
+            min-width: 100%; 
+            min-height: 100%;
+            z-index: -1;
+            object-fit: cover;
+            opacity: 80; /* Slight Transparency */
+        }}
+        .overlay {{
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(0,0,0,0.6); /* Dark Overlay for text readability */
+            z-index: -1;
+        }}
+    </style>
+    <video autoplay loop muted playsinline class="video-bg">
+        <source src="{bg_video}" type="video/mp4">
+    </video>
+    <div class="overlay"></div>
+    """, unsafe_allow_html=True)
+
+def render_prediction(t, predicted_date):
+    if not predicted_date:
+        return
+    days_left = (predicted_date - date.today()).days
+    msg = f"{t['predicted_next']}: **{days_left}** days (**{predicted_date.strftime('%d %b %Y')}**)"
+    if days_left < 0:
+        msg = f"{t['predicted_next']}: **{predicted_date.strftime('%d %b %Y')}** ({abs(days_left)} days ago)"
+    st.info(msg)
+
+def render_dashboard_view(t, username, predicted_date):
+    # Prediction Logic
+    render_prediction(t, predicted_date)
+    
+    # Chart (figure cached per user and data version)
+    cycles = get_user_cycles(username)
+    st.markdown(f"### {t['cycle_analysis']}")
+    fig_chart = render_cycle_chart(cycles, username)
+    if fig_chart:
+        st.plotly_chart(fig_chart, use_container_width=True)
+    else:
+        st.info(t['note'])
+
+    # Record History Table
+    if not cycles.empty:
+         st.markdown("---")
+         with st.expander(t['view_table']):
+            st.dataframe(cycles.sort_values("start_date", ascending=False), use_container_width=True)
+
+def render_log_view(t, username, predicted_date):
+    st.subheader(t['log_period'])
+    
+    # Show prediction here too
+    render_prediction(t, predicted_date)
+
+    with st.form("cycle_form"):
+        today_max = datetime.today()
+        start_d = st.date_input(t['start_date'], max_value=today_max, format="DD/MM/YYYY")
+        end_d = st.date_input(t['end_date'], max_value=today_max, format="DD/MM/YYYY")
+        
+        if st.form_submit_button(t['save_cycle']):
+            if end_d < start_d:
+                st.error(t['date_error'])
+            else:
+                save_cycle(username, start_d, end_d)
+                st.success(t['cycle_saved_msg'])
+                st.rerun()
+
+    # Bulk history import / export
+    with st.expander(t['import_export']):
+        uploaded = st.file_uploader(
+            t['import_help'],
+            type=["csv", "json", "jsonl"], key="cycle_import"
+        )
+        if uploaded and st.button(t['import'], key="btn_import"):
+            stream = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+            try:
+                result = import_cycles(username, stream, detect_format(uploaded.name))
+            except Exception:
+                logger.exception("cycle import failed for %s", username)
+                st.error("Import failed; no further rows were read. Please check the file and try again.")
+            else:
+                if result["failed"]:
+                    st.error(f"Import stopped early: {result['failed']}")
+                st.success(
+                    f"Imported {result['imported']} cycles; skipped {result['skipped']} invalid rows"
+                    f" and {result['duplicates']} already in your history."
+                )
+                for err in result["errors"]:
+                    st.caption(err)
+
+        # Export is generated when the button is clicked, not on every rerun
+        st.download_button(
+            t['export'],
+            data=lambda: export_cycles_text(username),
+            file_name="mahwari_cycles.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+def render_health_view(t, username):
+    render_water_tracker(t, username)
+    st.markdown("---")
+    render_exercise_guide(t)
+
+def render_debug_panel():
+    # Opt-in via ?debug=1; timings are only collected with MAHWARI_METRICS=1
+    if st.query_params.get("debug") != "1":
+        return
+    with st.expander("⏱️ Timings", expanded=True):
+        if not metrics.ENABLED:
+            st.caption("Start the app with MAHWARI_METRICS=1 to collect timings.")
+            return
+        snap = metrics.snapshot()
+        rows = "".join(
+            f"| {name} | {s['count']} | {s['p50']:.2f} | {s['p95']:.2f} | {s['p99']:.2f} |\n"
+            for name, s in snap["sections"].items()
+        )
+        st.markdown("| section | calls | p50 ms | p95 ms | p99 ms |\n|---|---:|---:|---:|---:|\n" + rows)
+        st.json({k: v for k, v in snap.items() if k not in ("enabled", "sections")}, expanded=False)
+
 def main():
+    if "session_start" not in st.session_state:
+        st.session_state["session_start"] = time.perf_counter()
+
     if "authenticated" not in st.session_state:
         st.session_state["authenticated"] = False
         
     if "show_settings" not in st.session_state:
         st.session_state["show_settings"] = False
 
-    load_css("assets/style.css")
+    with section("css"):
+        load_css("assets/style.css")
     
-    # --- Video Assets Logic ---
-    import base64
-    def get_base64_video(video_path):
-        try:
-            with open(video_path, "rb") as f:
-                data = f.read()
-            return base64.b64encode(data).decode()
-        except FileNotFoundError:
-            return None
-
     # 1. Loading Screen
-    if "has_loaded" not in st.session_state:
-        loading_video = get_base64_video("assets/loading.mp4")
-        if loading_video:
-            st.markdown(f"""
-            <style>
-                .stApp {{ overflow: hidden; }}
-                header {{ visibility: hidden; }}
-            </style>
-            <div style="position: fixed; top: 0; left: 0; width: 100vw; height: 100vh; background: black; z-index: 9999; display: flex; align-items: center; justify-content: center;">
-                <video autoplay muted playsinline style="width: 100%; height: 100%; object-fit: cover;">
-                    <source src="data:video/mp4;base64,{loading_video}" type="video/mp4">
-                </video>
-            </div>
-            """, unsafe_allow_html=True)
-            time.sleep(5) # Play for 5 seconds
-            st.session_state["has_loaded"] = True
-            st.rerun()
-        else:
-             st.session_state["has_loaded"] = True
+    render_splash()
 
     # 2. Background Video
-    bg_video = get_base64_video("assets/background.mp4")
-    if bg_video:
-        st.markdown(f"""
-        <style>
-            .stApp {{
-                background: transparent;
-            }}
-            .video-bg {{
-                position: fixed;
-                right: 0;
-                bottom: 0;
-                min-width: 100%; 
-                min-height: 100%;
-                z-index: -1;
-                object-fit: cover;
-                opacity: 80; /* Slight Transparency */
-            }}
-            .overlay {{
-                position: fixed;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                background: rgba(0,0,0,0.6); /* Dark Overlay for text readability */
-                z-index: -1;
-            }}
-        </style>
-        <video autoplay loop muted playsinline class="video-bg">
-            <source src="data:video/mp4;base64,{bg_video}" type="video/mp4">
-        </video>
-        <div class="overlay"></div>
-        """, unsafe_allow_html=True)
+    with section("background_video"):
+        render_background_video()
 
     if not st.session_state["authenticated"]:
         render_auth()
@@ -129,22 +299,7 @@ def main():
         settings = get_user_settings(username)
         hue = settings.get('hue', 0)
         lang = settings.get('language', 'en')
-        t = translations.get(lang, translations['en'])
-        
-        # Language Display Mapping
-        LANG_NAMES = {
-            "en": "English",
-            "ta": "Tamil (தமிழ்)",
-            "ml": "Malayalam (മലയാളം)",
-            "ur": "Urdu (اردو)",
-            "te": "Telugu (తెలుగు)",
-            "bn": "Bengali (বাংলা)",
-            "or": "Odia (ଓଡ଼ିଆ)",
-            "kn": "Kannada (ಕನ್ನಡ)",
-            "mr": "Marathi (मराठी)",
-            "hi": "Hindi (हिंदी)",
-            "ne": "Nepali (नेपाली)"
-        }
+        t = get_translations(lang)
         
         inject_custom_css(hue)
         
@@ -157,7 +312,7 @@ def main():
         
         with col2:
             # Settings Toggle Button (Aligned to right)
-            if st.button("⚙️", key="settings_btn", help=t.get('settings', "Settings")):
+            if st.button("⚙️", key="settings_btn", help=t['settings']):
                 st.session_state["show_settings"] = not st.session_state["show_settings"]
                 st.rerun()
 
@@ -173,7 +328,7 @@ def main():
                 st.rerun()
 
             # Language
-            lang_opts = list(translations.keys())
+            lang_opts = list(LANG_NAMES)
             new_lang = st.selectbox(
                 t['language'], 
                 lang_opts, 
@@ -188,8 +343,8 @@ def main():
             st.markdown("---")
             st.subheader(t['change_pin'])
             with st.form("change_pin_form"):
-                old_pin = st.text_input(t.get('security_pin', "Old PIN"), type="password", max_chars=6, key="old_p")
-                new_pin = st.text_input(t.get('change_pin', "New PIN"), type="password", max_chars=6, key="new_p")
+                old_pin = st.text_input(t['security_pin'], type="password", max_chars=6, key="old_p")
+                new_pin = st.text_input(t['change_pin'], type="password", max_chars=6, key="new_p")
                 
                 if st.form_submit_button(t['change_pin']):
                     if len(new_pin) < 6:
@@ -203,6 +358,7 @@ def main():
             
             st.markdown("---")
             if st.button(t['logout'], key="logout_btn", use_container_width=True):
+                flush_water_log(username)
                 st.session_state.clear()
                 st.rerun()
                 
@@ -210,65 +366,34 @@ def main():
 
         # --- Dashboard Content ---
         
-        # Tabs: Log Period (First), Tracker, Health
-        # Updated Labels with Emojis
-        tab_log, tab_dash, tab_health = st.tabs([f"🩸 {t['log_period']}", f"📊 {t['tab_tracker']}", f"💪 {t['tab_health']}"])
-        
-        cycles = get_user_cycles(username)
-        predicted_date = predict_next_period(cycles)
-        
-        with tab_dash:
-            # Prediction Logic
-            if predicted_date:
-                days_left = (predicted_date - date.today()).days
-                msg = f"{t['predicted_next']}: **{days_left}** days (**{predicted_date.strftime('%d %b %Y')}**)"
-                if days_left < 0:
-                    msg = f"{t['predicted_next']}: **{predicted_date.strftime('%d %b %Y')}** ({abs(days_left)} days ago)"
-                st.info(msg)
-            
-            # Chart
-            st.markdown(f"### {t['cycle_analysis']}")
-            fig_chart = render_cycle_chart(cycles)
-            if fig_chart:
-                st.plotly_chart(fig_chart, use_container_width=True)
-            else:
-                st.info(t.get('note', 'No data available'))
-
-            # Record History Table
-            if not cycles.empty:
-                 st.markdown("---")
-                 with st.expander(t['view_table']):
-                    st.dataframe(cycles.sort_values("start_date", ascending=False), use_container_width=True)
+        # Views: Log Period (First), Tracker, Health
+        labels = {"log": f"🩸 {t['log_period']}", "dash": f"📊 {t['tab_tracker']}", "health": f"💪 {t['tab_health']}"}
+        predicted_date = predict_next_period(get_cycle_stats(username))
 
+        def render_view(view):
+            with section(f"view_{view}"):
+                if view == "log":
+                    render_log_view(t, username, predicted_date)
+                elif view == "dash":
+                    render_dashboard_view(t, username, predicted_date)
+                else:
+                    render_health_view(t, username)
 
-        with tab_log:
-            st.subheader(t['log_period'])
-            
-            # Show prediction here too
-            if predicted_date:
-                days_left = (predicted_date - date.today()).days
-                msg = f"{t['predicted_next']}: **{days_left}** days (**{predicted_date.strftime('%d %b %Y')}**)"
-                if days_left < 0:
-                    msg = f"{t['predicted_next']}: **{predicted_date.strftime('%d %b %Y')}** ({abs(days_left)} days ago)"
-                st.info(msg)
-
-            with st.form("cycle_form"):
-                today_max = datetime.today()
-                start_d = st.date_input(t['start_date'], max_value=today_max, format="DD/MM/YYYY")
-                end_d = st.date_input(t['end_date'], max_value=today_max, format="DD/MM/YYYY")
-                
-                if st.form_submit_button(t['save_cycle']):
-                    if end_d < start_d:
-                        st.error(t['date_error'])
-                    else:
-                        save_cycle(username, start_d, end_d)
-                        st.success(t['cycle_saved_msg'])
-                        st.rerun()
+        mode = NAV_MODE if NAV_MODE in NAV_MODES else "lazy"
+        if mode == "tabs":
+            for tab, view in zip(st.tabs([labels[v] for v in VIEWS]), VIEWS):
+                with tab:
+                    render_view(view)
+        else:
+            active = st.radio(
+                "View", VIEWS, format_func=labels.get, key="nav",
+                horizontal=True, label_visibility="collapsed"
+            )
+            render_view(active)
 
-        with tab_health:
-            render_water_tracker(t)
-            st.markdown("---")
-            render_exercise_guide(t)
+    record_time_to_interactive()
 
 if __name__ == "__main__":
-    main()
+    with section("rerun"):
+        main()
+    render_debug_panel()
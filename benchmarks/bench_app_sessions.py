@@ -0,0 +1,306 @@
+"""
+Multi-session load test of app.py on Streamlit's AppTest.
+
+    python -m benchmarks.bench_app_sessions [--sessions 1,4,8] [--rounds 3]
+    python -m benchmarks.bench_app_sessions --save-baseline
+
+Seeds a throwaway SQLite file (--seed-users users, --seed-cycles cycles in
+total), then for each session count starts a fresh interpreter that drives
+that many simulated users concurrently through sign-up, sign-in, cycle
+logging, view switches, settings changes and the water tracker (--rounds
+times). Reports rerun latency percentiles, DB time per rerun (pooled
+connection checkout time), peak RSS and RSS per session (growth over a
+warmed-up interpreter, so one-time imports aren't charged to sessions).
+
+AppTest keeps process-global runtime state, so reruns from different
+sessions take turns on RUN_LOCK. Latency is measured from when a session
+asks to run, so it includes time queued behind other sessions, as on a busy
+single-process server where reruns mostly hold the GIL anyway. Service
+time (the rerun alone) is reported separately.
+
+Results are compared with BASELINE_FILE: a p95 latency or peak RSS more than
+--tolerance above the baseline for the same session count exits with
+status 1. The baseline records its MAHWARI_NAV mode; runs in another mode
+are not compared. Baselines are machine-specific; re-save them on the machine that
+runs the comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baselines", "app_sessions.json")
+PIN = "123456"
+RUN_LOCK = threading.Lock()
+VIEWS = ("log", "dash", "health") # app.VIEWS, in navigation order
+
+def _find(elements, label):
+    return next(e for e in elements if e.label == label)
+
+class Session:
+    """One simulated user; every step is one interaction (a rerun of app.py)."""
+
+    def __init__(self, n, latencies, service, lock):
+        from streamlit.testing.v1 import AppTest
+        self.n = n
+        self.username = f"load{n}"
+        self.at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+        self.latencies = latencies
+        self.service = service
+        self.lock = lock
+
+    def step(self, name, action):
+        queued = time.perf_counter()
+        with RUN_LOCK:
+            start = time.perf_counter()
+            action()
+            done = time.perf_counter()
+        if self.at.exception:
+            raise RuntimeError(f"session {self.n}, {name}: {self.at.exception[0].message}")
+        with self.lock:
+            self.latencies.setdefault(name, []).append((done - queued) * 1000)
+            self.service.append((done - start) * 1000)
+
+    def sign_up(self):
+        at = self.at
+        _find(at.text_input, "Full Name").input(f"Load Tester {self.n}")
+        _find(at.text_input, "Username (for Sign In)").input(self.username)
+        _find(at.text_input, "Email").input(f"{self.username}@example.com")
+        _find(at.text_input, "Create 6-Digit PIN").input(PIN)
+        for i in range(1, 7):
+            _find(at.text_input, f"Answer {i}").input("answer")
+        _find(at.button, "Sign Up").click().run()
+
+    def sign_in(self):
+        at = self.at
+        at.text_input(key="login_id").input(self.username)
+        at.text_input(key="login_pin").input(PIN)
+        at.button(key="btn_login").click().run()
+        if not at.session_state["authenticated"]:
+            raise RuntimeError(f"session {self.n}: sign-in failed")
+
+    def log_cycle(self, start):
+        at = self.at
+        _find(at.date_input, "Start Date").set_value(start)
+        _find(at.date_input, "End Date").set_value(start + timedelta(days=4))
+        _find(at.button, "Save Cycle").click().run()
+
+    def switch_view(self):
+        # Tabs switch in the browser without a rerun; a view selector widget
+        # (key "nav") does rerun, so drive it when the app has one
+        at = self.at
+        nav = [w for w in at.radio if w.key == "nav"]
+        if nav:
+            # options are the formatted labels; set_value takes the view key
+            nav[0].set_value(VIEWS[(nav[0].index + 1) % len(VIEWS)]).run()
+        else:
+            at.run()
+
+    def toggle_settings(self):
+        self.at.button(key="settings_btn").click().run()
+
+    def change_hue(self, round_no):
+        self.at.slider[0].set_value((round_no * 40 + self.n) % 360).run()
+
+    def add_water(self):
+        _find(self.at.button, "➕ Add").click().run()
+
+    def run(self, rounds):
+        self.step("open", self.at.run)
+        self.step("sign_up", self.sign_up)
+        self.step("sign_in", self.sign_in)
+        first = date.today() - timedelta(days=29 * (rounds + 1))
+        for r in range(rounds):
+            self.step("log_cycle", lambda: self.log_cycle(first + timedelta(days=29 * r)))
+            self.step("switch_view", self.switch_view)
+            self.step("switch_view", self.switch_view)
+            self.step("settings_open", self.toggle_settings)
+            self.step("settings_hue", lambda: self.change_hue(r))
+            self.step("settings_close", self.toggle_settings)
+            self.step("water", self.add_water)
+            # Back round to the log view for the next round's cycle
+            self.step("switch_view", self.switch_view)
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+def warm_up():
+    # One signed-in pass over every view (as a seeded user) so the one-time
+    # imports (pandas, plotly, ...) land before the RSS baseline instead of
+    # being split across the sessions
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.session_state["authenticated"] = True
+    at.session_state["username"] = "user0"
+    at.run()
+    for view in VIEWS:
+        nav = [w for w in at.radio if w.key == "nav"]
+        if nav:
+            nav[0].set_value(view).run()
+    if at.exception:
+        raise RuntimeError(f"warm-up: {at.exception[0].message}")
+
+def run_child(sessions, rounds, db_file):
+    """Runs in its own interpreter so peak RSS belongs to this session count."""
+    os.chdir(ROOT)
+    from modules import database_setup
+    database_setup.DB_FILE = db_file
+    warm_up()
+    rss_start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    latencies, service, lock, errors = {}, [], threading.Lock(), []
+    users = [Session(n, latencies, service, lock) for n in range(sessions)]
+    def worker(user):
+        try:
+            user.run(rounds)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+
+    db_before = database_setup.get_pool_stats()["busy_ms_total"]
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(u,)) for u in users]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    elapsed = time.perf_counter() - start
+    db_ms = database_setup.get_pool_stats()["busy_ms_total"] - db_before
+
+    reruns = [ms for samples in latencies.values() for ms in samples]
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "sessions": sessions,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "reruns": len(reruns),
+        "rerun_ms": percentiles(reruns) if reruns else {},
+        "service_ms": percentiles(service) if service else {},
+        "reruns_per_s": len(reruns) / elapsed,
+        "steps_p95_ms": {name: percentiles(s)["p95"] for name, s in sorted(latencies.items())},
+        "db_ms_per_rerun": db_ms / len(reruns) if reruns else 0.0,
+        "peak_rss_mb": peak / scale,
+        "rss_per_session_mb": (peak - rss_start) / scale / sessions,
+    }))
+
+def seed_database(db_file, users, cycles):
+    from modules import database_setup
+    from modules.cycle_stats import rebuild_all_stats
+    from modules.user_ids import rebuild_counters
+    from benchmarks.bench_db_indexes import seed
+    database_setup.DB_FILE = db_file
+    database_setup.init_db()
+    conn = database_setup.get_connection()
+    seed(conn, users, cycles)
+    rebuild_all_stats(conn)
+    rebuild_counters(conn)
+    conn.commit()
+    conn.close()
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for r in results:
+        base = baseline.get("results", {}).get(str(r["sessions"]))
+        if not base:
+            continue
+        for label, now, then in (
+            ("rerun p95 ms", r["rerun_ms"]["p95"], base["rerun_ms"]["p95"]),
+            ("peak RSS MB", r["peak_rss_mb"], base["peak_rss_mb"]),
+        ):
+            if now > then * (1 + tolerance):
+                failures.append(f"{r['sessions']} sessions: {label} {now:.1f} vs baseline {then:.1f}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", default="1,4,8", help="comma-separated session counts")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed-users", type=int, default=2000)
+    parser.add_argument("--seed-cycles", type=int, default=50_000)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed regression over baseline (0.5 = +50%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.rounds, args.db)
+        return
+
+    env = dict(os.environ, MAHWARI_SPLASH="off")
+    nav = env.setdefault("MAHWARI_NAV", "lazy")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "seed.db")
+        seed_database(template, args.seed_users, args.seed_cycles)
+        for count in (int(c) for c in args.sessions.split(",")):
+            # Every run starts from the same seeded file
+            db_file = os.path.join(tmp, f"run{count}.db")
+            with open(template, "rb") as src, open(db_file, "wb") as dst:
+                dst.write(src.read())
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_app_sessions", "--child", str(count),
+                 "--rounds", str(args.rounds), "--db", db_file],
+                cwd=ROOT, env=env, capture_output=True, text=True
+            )
+            if out.returncode != 0:
+                sys.exit(f"{count} sessions failed:\n{out.stderr[-2000:]}")
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"seed: {args.seed_users:,} users, {args.seed_cycles:,} cycles; {args.rounds} rounds per session")
+    print(f"{'sessions':>8}{'reruns':>8}{'rerun/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'service p50':>13}"
+          f"{'db ms/rerun':>13}{'peak RSS MB':>13}{'MB/session':>12}")
+    for r in results:
+        q = r["rerun_ms"]
+        print(f"{r['sessions']:>8}{r['reruns']:>8}{r['reruns_per_s']:>9.1f}{q['p50']:>9.1f}{q['p95']:>9.1f}{q['p99']:>9.1f}"
+              f"{r['service_ms']['p50']:>13.1f}{r['db_ms_per_rerun']:>13.2f}{r['peak_rss_mb']:>13.1f}{r['rss_per_session_mb']:>12.2f}")
+        for error in r["errors"]:
+            print(f"  error: {error}")
+    print("slowest steps (p95 ms, largest run):", {k: round(v, 1) for k, v in results[-1]["steps_p95_ms"].items()})
+
+    errors = [e for r in results for e in r["errors"]]
+    if args.save_baseline:
+        if errors:
+            sys.exit("not saving a baseline from a run with errors")
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump({
+                "machine": f"{platform.machine()} {platform.system()}, {os.cpu_count()} CPU, Python {platform.python_version()}",
+                "rounds": args.rounds,
+                "nav": nav,
+                "results": {str(r["sessions"]): r for r in results},
+            }, f, indent=2)
+        print(f"baseline saved to {os.path.relpath(BASELINE_FILE, ROOT)}")
+        return
+
+    try:
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    except OSError:
+        print("no baseline yet (run with --save-baseline)")
+        return
+    if baseline.get("nav", "tabs") != nav:
+        # View switches are client-side with tabs and reruns with lazy
+        # navigation, so the workloads differ
+        print(f"baseline was recorded with MAHWARI_NAV={baseline.get('nav', 'tabs')}, this run used {nav}; not comparing")
+        return
+    failures = compare(results, baseline, args.tolerance)
+    for message in failures:
+        print(f"REGRESSION: {message}")
+    if failures or errors:
+        sys.exit(1)
+    print(f"within {args.tolerance:.0%} of baseline ({baseline.get('machine', 'unknown machine')})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Month-grid render time.
+
+    python -m benchmarks.bench_calendar [--months 240] [--repeat 200]
+
+Times build_month_html for each month of a 20-year span, first with a cold
+skeleton cache and then warm (the steady state across reruns).
+"""
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+
+from modules.calendar_logic import build_month_html, month_skeleton
+
+def render_all(months, repeat):
+    today = date.today()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for year, month in months:
+            mask = np.zeros(31, dtype=bool)
+            mask[2:7] = True
+            build_month_html(year, month, mask, date(year, month, 28), today)
+    return (time.perf_counter() - start) / (repeat * len(months)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--months", type=int, default=240)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    months = [(2006 + i // 12, i % 12 + 1) for i in range(args.months)]
+    month_skeleton.cache_clear()
+    cold = render_all(months, 1)
+    warm = render_all(months, args.repeat)
+    print(f"{args.months} months: cold {cold:.1f} us/month, warm {warm:.1f} us/month")
+
+if __name__ == "__main__":
+    main()
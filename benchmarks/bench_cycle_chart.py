@@ -0,0 +1,93 @@
+"""
+Cost of building the cycle history chart.
+
+    python -m benchmarks.bench_cycle_chart [--years 20] [--calls 50]
+
+Compares the original merge + row-wise apply implementation with the
+vectorised build_cycle_chart and a cached render_cycle_chart hit, on a
+monthly history of the given length. Also checks both builds produce the
+same bars and hover text.
+"""
+import argparse
+import logging
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from modules.calendar_logic import build_cycle_chart, render_cycle_chart
+
+def build_chart_apply(cycles_df):
+    # The pre-vectorisation implementation, kept here for comparison
+    import plotly.graph_objects as go
+    df = cycles_df.copy()
+    df['start_date'] = pd.to_datetime(df['start_date'])
+    df['end_date'] = pd.to_datetime(df['end_date'])
+    df['duration'] = (df['end_date'] - df['start_date']).dt.days + 1
+    df['month_dt'] = df['start_date'].dt.to_period('M').dt.to_timestamp()
+    full_range = pd.date_range(start=df['month_dt'].min(), end=df['month_dt'].max(), freq='MS')
+    merged = pd.merge(pd.DataFrame({'month_dt': full_range}), df, on='month_dt', how='left')
+    merged['duration'] = merged['duration'].fillna(0)
+    merged['start_date'] = merged['start_date'].fillna(merged['month_dt'])
+    merged['end_date'] = merged['end_date'].fillna(merged['month_dt'])
+    merged['month_label'] = merged['month_dt'].dt.strftime('%B %Y')
+
+    def build_hover(row):
+        if row['duration'] == 0:
+            return "No Data"
+        return (
+            "Start: " + row['start_date'].strftime('%d/%m/%Y') + "<br>" +
+            "End: " + row['end_date'].strftime('%d/%m/%Y') + "<br>" +
+            "Duration: " + str(int(row['duration'])) + " days"
+        )
+
+    merged['hover_text'] = merged.apply(build_hover, axis=1)
+    fig = go.Figure(data=[go.Bar(
+        x=merged['month_label'], y=merged['duration'], marker_color='#ff4081',
+        hovertext=merged['hover_text'], hoverinfo="text"
+    )])
+    fig.update_layout(
+        title="Cycle Duration History", xaxis_title="Month", yaxis_title="Duration (Days)",
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font={'color': 'white'},
+        margin=dict(l=10, r=10, t=30, b=10), autosize=True, height=300
+    )
+    return fig
+
+def history(years):
+    # Roughly monthly cycles with the odd skipped month
+    rows, start = [], date.today() - timedelta(days=365 * years)
+    for i in range(years * 12):
+        rows.append((i + 1, "bench", str(start), str(start + timedelta(days=4 + i % 3)), 5 + i % 3))
+        start += timedelta(days=28 + (9 if i % 17 == 0 else i % 4))
+    return pd.DataFrame(rows, columns=["id", "username", "start_date", "end_date", "duration"])
+
+def measure(fn, calls):
+    fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+    # Cached calls outside `streamlit run` log a "no runtime" warning each time
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    cycles = history(args.years)
+    old, new = build_chart_apply(cycles).data[0], build_cycle_chart(cycles).data[0]
+    same = list(old.x) == list(new.x) and list(old.y) == list(new.y) and list(old.hovertext) == list(new.hovertext)
+
+    apply_ms = measure(lambda: build_chart_apply(cycles), args.calls)
+    vector_ms = measure(lambda: build_cycle_chart(cycles), args.calls)
+    cached_ms = measure(lambda: render_cycle_chart(cycles, "bench"), args.calls)
+
+    print(f"{len(cycles)} cycles over {args.years} years, {len(new.x)} bars (identical output: {same})")
+    print(f"merge + apply build:   {apply_ms:8.2f} ms")
+    print(f"vectorised build:      {vector_ms:8.2f} ms")
+    print(f"cached (same version): {cached_ms:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Bulk import / export throughput.
+
+    python -m benchmarks.bench_cycle_import [--rows 100000]
+
+Writes a CSV of synthetic history, imports it with import_cycles, then
+exports it back with export_cycles, reporting rows per second for each.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from modules import database_setup
+from modules.cycle_io import import_cycles, export_cycles
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_setup.DB_FILE = os.path.join(tmp, "bench.db")
+        database_setup.init_db()
+
+        src = os.path.join(tmp, "history.csv")
+        first = date.today() - timedelta(days=args.rows + 10)
+        with open(src, "w", newline="") as f:
+            f.write("start_date,end_date\n")
+            for i in range(args.rows):
+                start = first + timedelta(days=i)
+                f.write(f"{start},{start + timedelta(days=4)}\n")
+        size_mb = os.path.getsize(src) / 1e6
+
+        with open(src, newline="") as f:
+            start = time.perf_counter()
+            result = import_cycles("bench", f, "csv")
+            import_s = time.perf_counter() - start
+
+        out = os.path.join(tmp, "export.csv")
+        with open(out, "w", newline="") as f:
+            start = time.perf_counter()
+            export_cycles("bench", f)
+            export_s = time.perf_counter() - start
+
+    print(f"{args.rows:,} rows ({size_mb:.1f} MB CSV)")
+    print(f"import: {import_s:.2f}s ({result['imported'] / import_s:,.0f} rows/s), skipped {result['skipped']}, duplicates {result['duplicates']}")
+    print(f"export: {export_s:.2f}s ({args.rows / export_s:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Lookup latency before/after the index migration.
+
+    python -m benchmarks.bench_db_indexes [--users 100000] [--cycles 1000000]
+
+Seeds a throwaway database, times the app's hot lookups with every index on
+cycles and users dropped, then re-applies the index migrations and times
+them again.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from modules import database_setup
+
+QUERIES = {
+    "get_user_cycles": ("SELECT * FROM cycles WHERE username = ?", lambda u: (f"user{u}",)),
+    "authenticate_user": ("SELECT pin_hash, username FROM users WHERE username = ? OR user_id = ?", lambda u: (f"Name-{u:06d}", f"Name-{u:06d}")),
+    "get_security_questions": ("SELECT security_questions, user_id, username FROM users WHERE user_id = ? OR email = ? OR username = ?", lambda u: (f"user{u}@example.com",) * 3),
+}
+
+# Migrations that (re)create the indexes the queries above rely on
+INDEX_MIGRATIONS = (
+    database_setup._add_lookup_indexes,
+    database_setup._add_cycle_end_index,
+    database_setup._add_unique_user_constraints,
+)
+
+def seed(conn, users, cycles):
+    conn.executemany(
+        "INSERT INTO users (username, name, email, user_id, pin_hash, security_questions) VALUES (?, ?, ?, ?, '', '{}')",
+        ((f"user{u}", "Name", f"user{u}@example.com", f"Name-{u:06d}") for u in range(users))
+    )
+    base = date(2000, 1, 1)
+    def rows():
+        for i in range(cycles):
+            start = base + timedelta(days=(i // users) * 29)
+            yield (f"user{i % users}", str(start), str(start + timedelta(days=4)), 5)
+    conn.executemany("INSERT INTO cycles (username, start_date, end_date, duration) VALUES (?, ?, ?, ?)", rows())
+    conn.commit()
+
+def time_queries(conn, users, samples):
+    rng = random.Random(0)
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        timings = []
+        for _ in range(samples):
+            args = params(rng.randrange(users))
+            start = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = (statistics.median(timings), max(timings))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--cycles", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_setup.DB_FILE = os.path.join(tmp, "bench.db")
+        database_setup.init_db()
+        conn = database_setup.get_connection()
+        seed(conn, args.users, args.cycles)
+
+        # "Before": no secondary indexes on the looked-up tables, whichever
+        # migrations have added them since
+        indexes = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ('cycles', 'users')"
+        )]
+        for index in indexes:
+            conn.execute(f"DROP INDEX {index}")
+        conn.commit()
+        before = time_queries(conn, args.users, args.samples)
+
+        start = time.perf_counter()
+        for migrate in INDEX_MIGRATIONS:
+            migrate(conn)
+        conn.commit()
+        migrate_s = time.perf_counter() - start
+        after = time_queries(conn, args.users, args.samples)
+        conn.close()
+
+    print(f"{args.users:,} users, {args.cycles:,} cycles (dropped {', '.join(indexes)}; index build {migrate_s:.1f}s)")
+    print(f"{'query':<24}{'before p50/max ms':>20}{'after p50/max ms':>20}")
+    for name in QUERIES:
+        b, a = before[name], after[name]
+        print(f"{name:<24}{b[0]:>11.3f} /{b[1]:>7.3f}{a[0]:>11.3f} /{a[1]:>7.3f}")
+
+if __name__ == "__main__":
+    main()
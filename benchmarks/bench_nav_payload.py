@@ -0,0 +1,116 @@
+"""
+Rendered payload per interaction: every view in st.tabs vs lazy navigation.
+
+    python -m benchmarks.bench_nav_payload [--years 20] [--rounds 3]
+
+Seeds a throwaway SQLite file with one user and a monthly history of the
+given length, then drives the signed-in dashboard on AppTest once per
+MAHWARI_NAV mode through the same interactions (open, log a cycle, add a
+glass of water, visit each view). For each interaction it reports the
+serialized size of the element tree the rerun produced (what the server
+sends to the browser) and the rerun time.
+
+Switching views is free in tabs mode (the browser flips tabs) but a rerun
+in lazy mode, so the totals row counts the switches too.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERNAME = "navbench"
+MODES = ("tabs", "lazy")
+
+def payload_bytes(node):
+    size = node.proto.ByteSize() if getattr(node, "proto", None) is not None else 0
+    for child in getattr(node, "children", {}).values():
+        size += payload_bytes(child)
+    return size
+
+def seed(db_file, years):
+    from modules import database_setup
+    from modules.auth import register_user
+    from modules.calendar_logic import save_cycle
+    database_setup.DB_FILE = db_file
+    database_setup.init_db()
+    register_user("Nav Bench", USERNAME, f"{USERNAME}@example.com", "", "2000-01-01", "123456", {})
+    start = date.today() - timedelta(days=365 * years)
+    while start < date.today() - timedelta(days=60):
+        save_cycle(USERNAME, start, start + timedelta(days=4))
+        start += timedelta(days=29)
+
+def drive(mode, rounds):
+    """Returns [(interaction, payload bytes, ms)] for one mode."""
+    from streamlit.testing.v1 import AppTest
+    os.environ["MAHWARI_NAV"] = mode
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.session_state["authenticated"] = True
+    at.session_state["username"] = USERNAME
+    rows = []
+
+    def step(name, action):
+        start = time.perf_counter()
+        action()
+        ms = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise RuntimeError(f"{mode}, {name}: {at.exception[0].message}")
+        rows.append((name, payload_bytes(at._tree), ms))
+
+    def show(view):
+        nav = [w for w in at.radio if w.key == "nav"]
+        if nav:
+            nav[0].set_value(view).run()
+
+    step("open", at.run)
+    for r in range(rounds):
+        day = date.today() - timedelta(days=50 - r)
+        if mode == "lazy":
+            step("view log", lambda: show("log"))
+        step("log_cycle", lambda: (
+            next(w for w in at.date_input if w.label == "Start Date").set_value(day),
+            next(w for w in at.date_input if w.label == "End Date").set_value(day + timedelta(days=4)),
+            next(w for w in at.button if w.label == "Save Cycle").click().run(),
+        ))
+        if mode == "lazy":
+            step("view health", lambda: show("health"))
+        step("water", lambda: next(w for w in at.button if w.label == "➕ Add").click().run())
+        if mode == "lazy":
+            step("view dash", lambda: show("dash"))
+    return rows
+
+def summarise(rows):
+    by_name = {}
+    for name, size, ms in rows:
+        by_name.setdefault(name, []).append((size, ms))
+    return {name: (sum(s for s, _ in v) / len(v), sum(m for _, m in v) / len(v)) for name, v in by_name.items()}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    os.environ["MAHWARI_SPLASH"] = "off"
+    with tempfile.TemporaryDirectory() as tmp:
+        seed(os.path.join(tmp, "nav.db"), args.years)
+        results = {mode: drive(mode, args.rounds) for mode in MODES}
+
+    tabs, lazy = summarise(results["tabs"]), summarise(results["lazy"])
+    print(f"{args.years} years of history, {args.rounds} rounds")
+    print(f"{'interaction':<14}{'tabs KB':>10}{'lazy KB':>10}{'saved':>8}{'tabs ms':>10}{'lazy ms':>10}")
+    for name in dict.fromkeys(list(tabs) + list(lazy)):
+        t_size, t_ms = tabs.get(name, (0.0, 0.0))
+        l_size, l_ms = lazy.get(name, (0.0, 0.0))
+        saved = f"{1 - l_size / t_size:>8.0%}" if t_size else f"{'-':>8}"
+        print(f"{name:<14}{t_size / 1024:>10.1f}{l_size / 1024:>10.1f}{saved}{t_ms:>10.1f}{l_ms:>10.1f}")
+
+    totals = {mode: (sum(s for _, s, _ in rows), sum(m for _, _, m in rows), len(rows)) for mode, rows in results.items()}
+    for mode, (size, ms, reruns) in totals.items():
+        print(f"total {mode:<5}: {reruns} reruns, {size / 1024:.1f} KB sent, {ms:.0f} ms")
+    print(f"payload saved by lazy navigation: {1 - totals['lazy'][0] / totals['tabs'][0]:.0%} (view switches included)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Population-wide PCOD risk scoring: batch engine vs. a per-user loop.
+
+    python -m benchmarks.bench_pcod_batch [--users 100000] [--cycles 1000000] [--workers 4]
+
+Seeds cycles with randomised gaps, runs compute_risk_scores single-process
+and sharded, then times the old approach (one query + calculate_pcod_risk
+per user) on a sample of users and extrapolates it to the whole population.
+Also checks the batch tiers agree with calculate_pcod_risk on that sample.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from modules import database_setup
+from modules.pcod_batch import compute_risk_scores, save_risk_scores, INSUFFICIENT, TIERS
+from modules.pcod_logic import calculate_pcod_risk
+
+def seed(conn, users, cycles, rng):
+    base = date(2000, 1, 1)
+    per_user = cycles // users
+    def rows():
+        for u in range(users):
+            start = base + timedelta(days=rng.randrange(60))
+            # Mix of regular, irregular and long-cycle users
+            mean, spread = rng.choice([(28, 2), (30, 8), (40, 3), (19, 1)])
+            for _ in range(per_user):
+                yield (f"user{u}", str(start), str(start + timedelta(days=4)), 5)
+                start += timedelta(days=max(10, int(rng.gauss(mean, spread))))
+    conn.executemany("INSERT INTO cycles (username, start_date, end_date, duration) VALUES (?, ?, ?, ?)", rows())
+    conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--cycles", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--sample", type=int, default=2000, help="users timed with the per-user loop")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_setup.DB_FILE = os.path.join(tmp, "bench.db")
+        database_setup.init_db()
+        conn = database_setup.get_connection()
+        seed(conn, args.users, args.cycles, rng)
+
+        start = time.perf_counter()
+        results = compute_risk_scores(workers=1)
+        single_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sharded = compute_risk_scores(workers=args.workers)
+        sharded_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        save_risk_scores(sharded)
+        save_s = time.perf_counter() - start
+
+        names, _, _, _, tier = results[0]
+        batch = {n: (TIERS[t] if t >= 0 else INSUFFICIENT) for n, t in zip(names, tier)}
+        sample = rng.sample(range(args.users), min(args.sample, args.users))
+        mismatches = 0
+        start = time.perf_counter()
+        for u in sample:
+            df = pd.read_sql_query("SELECT * FROM cycles WHERE username = ?", conn, params=(f"user{u}",))
+            if calculate_pcod_risk(df) != batch[f"user{u}"]:
+                mismatches += 1
+        loop_s = (time.perf_counter() - start) / len(sample) * args.users
+        stored = conn.execute("SELECT COUNT(*) FROM risk_scores").fetchone()[0]
+        conn.close()
+
+    tiers = np.bincount(tier + 1, minlength=4)
+    print(f"{args.users:,} users, {args.cycles:,} cycles")
+    print(f"per-user loop (extrapolated from {len(sample)}): {loop_s:8.2f}s")
+    print(f"batch, 1 process:                {single_s:8.2f}s ({loop_s / single_s:.0f}x)")
+    print(f"batch, {args.workers} processes:             {sharded_s:8.2f}s ({loop_s / sharded_s:.0f}x)")
+    print(f"write risk_scores:               {save_s:8.2f}s ({stored:,} rows)")
+    print(f"tiers insufficient/low/medium/high: {tiers.tolist()}; mismatches vs calculate_pcod_risk: {mismatches}")
+
+if __name__ == "__main__":
+    main()
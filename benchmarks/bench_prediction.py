@@ -0,0 +1,90 @@
+"""
+Per-call cost of the next-period prediction path.
+
+    python -m benchmarks.bench_prediction [--cycles 240] [--calls 2000]
+
+Compares the original DataFrame pipeline (read_sql + to_datetime + diff)
+with the typed CycleSeries path and the O(1) cycle_stats read, reporting
+mean latency and peak allocated bytes per call.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from modules import database_setup
+from modules.cycle_model import CycleSeries
+from modules.cycle_stats import load_stats, rebuild_stats
+
+USER = "bench"
+
+def predict_pandas(conn):
+    # The pre-CycleSeries implementation, kept here for comparison
+    import pandas as pd
+    cycles_df = pd.read_sql("SELECT * FROM cycles WHERE username = ?", conn, params=(USER,))
+    last_start = datetime.strptime(cycles_df.iloc[-1]['start_date'], '%Y-%m-%d').date()
+    avg_length = 28
+    if len(cycles_df) > 1:
+        cycles_df['start_date'] = pd.to_datetime(cycles_df['start_date'])
+        cycles_df = cycles_df.sort_values('start_date')
+        diffs = cycles_df['start_date'].diff().dt.days.dropna()
+        if not diffs.empty:
+            avg_length = int(diffs.mean())
+    return last_start + timedelta(days=avg_length)
+
+def predict_series(conn):
+    rows = conn.execute(
+        "SELECT id, start_date, end_date, duration FROM cycles WHERE username = ? ORDER BY start_date", (USER,)
+    ).fetchall()
+    series = CycleSeries.from_rows(rows)
+    mean_gap = series.mean_gap()
+    return series.last_start() + timedelta(days=int(mean_gap) if mean_gap else 28)
+
+def predict_stats(conn):
+    stats = load_stats(conn, USER)
+    return date.fromisoformat(stats["last_start"]) + timedelta(days=int(stats["gap_mean"]) if stats["gap_count"] else 28)
+
+def measure(fn, conn, calls):
+    fn(conn) # warm up (imports, statement cache)
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn(conn)
+    latency_us = (time.perf_counter() - start) / calls * 1e6
+
+    tracemalloc.start()
+    fn(conn)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return latency_us, peak
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=240, help="history length (240 = 20 years)")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_setup.DB_FILE = os.path.join(tmp, "bench.db")
+        database_setup.init_db()
+        conn = database_setup.get_connection()
+        start = date(2005, 1, 1)
+        for i in range(args.cycles):
+            s = start + timedelta(days=i * 29)
+            conn.execute("INSERT INTO cycles (username, start_date, end_date, duration) VALUES (?, ?, ?, 5)",
+                         (USER, str(s), str(s + timedelta(days=4))))
+        rebuild_stats(conn, USER)
+        conn.commit()
+
+        assert predict_pandas(conn) == predict_series(conn) == predict_stats(conn)
+
+        print(f"{args.cycles} cycles, {args.calls} calls")
+        print(f"{'path':<10}{'us/call':>12}{'peak bytes':>14}")
+        for name, fn in (("pandas", predict_pandas), ("series", predict_series), ("stats", predict_stats)):
+            latency, peak = measure(fn, conn, args.calls)
+            print(f"{name:<10}{latency:>12.1f}{peak:>14,}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+N simultaneous sign-ins, hashing inline vs on the bounded pool.
+
+    python -m benchmarks.bench_signin_storm [--sessions 64]
+
+For each mode reports sign-in latency percentiles, rejections, and how long
+a concurrent "bystander" rerun (a small pure-Python workload) took while the
+storm was in progress.
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from passlib.context import CryptContext
+
+from modules import pin_hasher
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+PIN_HASH = pwd_context.hash("123456")
+
+def bystander(stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        sum(i * i for i in range(20_000))
+        samples.append((time.perf_counter() - start) * 1000)
+
+def storm(sessions, verify):
+    latencies, rejected = [], 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def sign_in():
+        nonlocal rejected
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            verify("123456", PIN_HASH)
+        except pin_hasher.HasherBusy:
+            with lock:
+                rejected += 1
+            return
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    stop, bystander_ms = threading.Event(), []
+    watcher = threading.Thread(target=bystander, args=(stop, bystander_ms))
+    watcher.start()
+    threads = [threading.Thread(target=sign_in) for _ in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    watcher.join()
+    return latencies, rejected, elapsed, bystander_ms
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=64)
+    args = parser.parse_args()
+
+    modes = {
+        "inline": pwd_context.verify,
+        "pool": lambda pin, hashed: pin_hasher.run(pwd_context.verify, pin, hashed),
+    }
+    print(f"{args.sessions} simultaneous sign-ins, {pin_hasher.HASH_WORKERS} workers, queue limit {pin_hasher.HASH_QUEUE_LIMIT}")
+    print(f"{'mode':<8}{'ok':>5}{'rejected':>10}{'p50 ms':>9}{'p95 ms':>9}{'total s':>9}{'bystander p95 ms':>18}")
+    for name, verify in modes.items():
+        latencies, rejected, elapsed, bystander_ms = storm(args.sessions, verify)
+        q = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else [0] * 19
+        b = statistics.quantiles(bystander_ms, n=20)[18] if len(bystander_ms) > 1 else 0
+        print(f"{name:<8}{len(latencies):>5}{rejected:>10}{q[9]:>9.1f}{q[18]:>9.1f}{elapsed:>9.2f}{b:>18.1f}")
+    print(pin_hasher.get_hash_stats())
+
+if __name__ == "__main__":
+    main()
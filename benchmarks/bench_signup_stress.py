@@ -0,0 +1,72 @@
+"""
+Concurrent sign-up stress test for register_user.
+
+    python -m benchmarks.bench_signup_stress [--threads 16] [--per-thread 200]
+
+Every thread registers its own users plus a share of deliberately
+duplicated usernames/emails. Reports throughput, how many duplicates were
+rejected with the right message, and the lock-contention rate (attempts
+that failed with "database is locked" after the busy timeout).
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from modules import database_setup
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--per-thread", type=int, default=200)
+    parser.add_argument("--duplicate-every", type=int, default=10, help="every Nth attempt reuses a shared username")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_setup.DB_FILE = os.path.join(tmp, "bench.db")
+        database_setup.init_db()
+        from modules.auth import register_user
+
+        lock = threading.Lock()
+        results = {"ok": 0, "duplicate": 0, "locked": 0, "other": 0}
+        latencies = []
+        barrier = threading.Barrier(args.threads)
+
+        def worker(t):
+            barrier.wait()
+            for i in range(args.per_thread):
+                username = f"shared{i}" if i % args.duplicate_every == 0 else f"t{t}u{i}"
+                start = time.perf_counter()
+                try:
+                    ok, msg, _ = register_user("Priya Sharma", username, f"{username}@example.com", "", "2000-01-01", "123456", {})
+                    outcome = "ok" if ok else ("duplicate" if "already" in msg else "other")
+                except sqlite3.OperationalError as e:
+                    outcome = "locked" if "locked" in str(e) else "other"
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    results[outcome] += 1
+                    latencies.append(elapsed)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(args.threads)]
+        start = time.perf_counter()
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        elapsed = time.perf_counter() - start
+
+        with database_setup.transaction() as conn:
+            ids = conn.execute("SELECT COUNT(*), COUNT(DISTINCT user_id) FROM users").fetchone()
+
+    attempts = sum(results.values())
+    q = statistics.quantiles(latencies, n=20)
+    print(f"{args.threads} threads x {args.per_thread} sign-ups in {elapsed:.2f}s -> {results['ok'] / elapsed:.0f} sign-ups/s")
+    print(f"results: {results}  (users {ids[0]}, distinct user IDs {ids[1]})")
+    print(f"latency p50 {q[9]:.1f} ms, p95 {q[18]:.1f} ms; lock contention rate {results['locked'] / attempts:.2%}")
+    print(f"pool: {database_setup.get_pool_stats()}")
+
+if __name__ == "__main__":
+    main()
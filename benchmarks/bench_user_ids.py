@@ -0,0 +1,59 @@
+"""
+User ID allocation cost while registering many users with common names.
+
+    python -m benchmarks.bench_user_ids [--users 100000]
+
+Compares the original COUNT(*) + probe loop with the per-prefix counter,
+each inserting users one transaction at a time into a fresh database.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from modules import database_setup
+from modules.user_ids import next_user_id
+
+COMMON_NAMES = ["Priya", "Anjali", "Fatima", "Lakshmi", "Sneha", "Divya", "Pooja", "Ayesha", "Meera", "Kavya"]
+
+def count_and_probe(conn, name):
+    # The original generate_user_id, kept here for comparison
+    first_name = name.split()[0].capitalize()
+    count = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] + 1
+    user_id = f"{first_name}-{count:03d}"
+    while conn.execute("SELECT user_id FROM users WHERE user_id = ?", (user_id,)).fetchone():
+        count += 1
+        user_id = f"{first_name}-{count:03d}"
+    return user_id
+
+def register_all(allocate, users):
+    conn = database_setup.get_connection()
+    rng = random.Random(0)
+    checkpoints = {}
+    start = time.perf_counter()
+    for i in range(users):
+        name = rng.choice(COMMON_NAMES)
+        user_id = allocate(conn, name)
+        conn.execute("INSERT INTO users (username, name, user_id) VALUES (?, ?, ?)", (f"user{i}", name, user_id))
+        conn.commit()
+        if (i + 1) % (users // 4) == 0:
+            checkpoints[i + 1] = time.perf_counter() - start
+    conn.close()
+    return checkpoints
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{args.users:,} sign-ups over {len(COMMON_NAMES)} first names (cumulative seconds)")
+    for label, allocate in (("count+probe", count_and_probe), ("counter", next_user_id)):
+        with tempfile.TemporaryDirectory() as tmp:
+            database_setup.DB_FILE = os.path.join(tmp, "bench.db")
+            database_setup.init_db()
+            checkpoints = register_all(allocate, args.users)
+        print(f"{label:<12}" + "".join(f"{n:>10,}: {s:6.1f}s" for n, s in checkpoints.items()))
+
+if __name__ == "__main__":
+    main()
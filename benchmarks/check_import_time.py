@@ -0,0 +1,82 @@
+"""
+Startup import budget for the app's own modules.
+
+    python -m benchmarks.check_import_time [--budget-ms 150] [--runs 3]
+
+Imports streamlit and then every module app.py imports from modules/, in a
+fresh interpreter under -X importtime. Fails (exit status 1) when the
+modules' cumulative import time, best of --runs, exceeds the budget, or when
+any of them pulls in a dependency that should only load on first use.
+Streamlit's own import cost is outside the budget.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Loaded lazily inside the functions that need them
+DEFERRED = ("pandas", "numpy", "passlib", "plotly.figure_factory", "pyarrow")
+
+def app_modules(app_file=os.path.join(ROOT, "app.py")):
+    with open(app_file) as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and (node.module or "").startswith("modules."):
+            names.append(node.module)
+        elif isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names if alias.name.startswith("modules."))
+    return sorted(set(names))
+
+def measure(modules):
+    code = "import streamlit\n" + "".join(f"import {name}\n" for name in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    total_us, deferred, children = 0, set(), []
+    # Children are reported before their parent; a top-level line closes the block
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip() == "cumulative":
+            continue
+        depth = len(name) - len(name.lstrip()) - 1
+        name = name.strip()
+        if depth > 0:
+            children.append(name)
+            continue
+        if name.split(".")[0] == "modules":
+            total_us += int(cumulative)
+            deferred.update(d for d in DEFERRED for n in children if n == d or n.startswith(d + "."))
+        children = []
+    return total_us / 1000, deferred
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=150)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    modules = app_modules()
+    results = [measure(modules) for _ in range(args.runs)]
+    best_ms = min(ms for ms, _ in results)
+    deferred = set().union(*(found for _, found in results))
+
+    print(f"{len(modules)} app modules: {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+    failed = False
+    if best_ms > args.budget_ms:
+        print(f"FAIL: import time over budget by {best_ms - args.budget_ms:.1f} ms")
+        failed = True
+    if deferred:
+        print(f"FAIL: imported at startup, should be deferred to first use: {', '.join(sorted(deferred))}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
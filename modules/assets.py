@@ -0,0 +1,160 @@
+import streamlit as st
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+
+# Streamlit serves files in ./static at app/static/<name> when
+# server.enableStaticServing is on (see .streamlit/config.toml). Media that
+# is always shown (the splash / background videos) lives there directly.
+STATIC_DIR = "static"
+STATIC_URL = "app/static"
+# Written by `python -m modules.build_assets`
+MANIFEST_FILE = os.path.join(STATIC_DIR, "manifest.json")
+
+# Upper bound on encoded assets kept in memory (videos + exercise images)
+MAX_CACHED_ASSETS = 32
+# Digests are 16-character strings, so every static file (each image has a
+# variant per width and format) can keep one
+MAX_CACHED_DIGESTS = 4096
+# Rendered <img>/<picture> tags, per image, size and styling
+MAX_CACHED_TAGS = 256
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+# mtime is part of every cache key below, so an edited file is re-read on the
+# next access while unchanged files are hashed / encoded once per process.
+@st.cache_resource(max_entries=MAX_CACHED_DIGESTS, show_spinner=False)
+def _load_digest(path, mtime):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+@st.cache_resource(max_entries=MAX_CACHED_ASSETS, show_spinner=False)
+def _load_base64(path, mtime):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+@st.cache_resource(max_entries=MAX_CACHED_ASSETS, show_spinner=False)
+def _load_text(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def get_text_asset(path):
+    # Stylesheets and other text assets, read once per process
+    mtime = _mtime(path)
+    if mtime is None:
+        return ""
+    return _load_text(path, mtime)
+
+def asset_digest(path):
+    mtime = _mtime(path)
+    if mtime is None:
+        return ""
+    return _load_digest(path, mtime)
+
+def get_base64_asset(path):
+    mtime = _mtime(path)
+    if mtime is None:
+        return ""
+    return _load_base64(path, mtime)
+
+def _static_path(path):
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    static_path = os.path.join(STATIC_DIR, os.path.basename(path))
+    return static_path if os.path.exists(static_path) else None
+
+def asset_src(path, mime=None):
+    """
+    Returns a value for an <img>/<video> ``src`` attribute.
+    Files with a copy in the static folder are referenced by URL, versioned
+    with their content hash so the browser can cache them across reruns.
+    Anything else falls back to a (cached) base64 data URI.
+    """
+    static_path = _static_path(path)
+    if static_path:
+        return f"{STATIC_URL}/{os.path.basename(static_path)}?v={asset_digest(static_path)}"
+
+    b64 = get_base64_asset(path)
+    if not b64:
+        return ""
+    mime = mime or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return f"data:{mime};base64,{b64}"
+
+# --- Resized variants (see modules/build_assets.py) ---
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_manifest(mtime):
+    with open(MANIFEST_FILE) as f:
+        return json.load(f)
+
+def get_manifest():
+    mtime = _mtime(MANIFEST_FILE)
+    if mtime is None:
+        return {}
+    return _load_manifest(mtime)
+
+def pick_variant(entry, display_width, fmt="webp", density=2):
+    # Smallest variant that still covers the display width on a 2x screen,
+    # or the largest one available if none does.
+    variants = sorted((v for v in entry["variants"] if v["format"] == fmt), key=lambda v: v["width"])
+    if not variants:
+        return None
+    for v in variants:
+        if v["width"] >= display_width * density:
+            return v
+    return variants[-1]
+
+def _srcset(variants, fmt):
+    return ", ".join(
+        f"{asset_src(v['path'])} {v['width']}w" for v in variants if v["format"] == fmt
+    )
+
+def image_tag(path, display_width, css_class=None, style=None):
+    """
+    <img> (or <picture> when an AVIF variant exists) for ``path`` shown at
+    ``display_width`` CSS pixels. Uses the built variants from the manifest
+    when present and falls back to the original file otherwise.
+    """
+    attrs = ""
+    if css_class:
+        attrs += f' class="{css_class}"'
+    if style:
+        attrs += f' style="{style}"'
+
+    entry = get_manifest().get(path)
+    fallback = pick_variant(entry, display_width) if entry else None
+    if not fallback:
+        src = asset_src(path)
+        return f'<img src="{src}"{attrs}>' if src else ""
+    # The variants only change when build_assets rewrites the manifest, so
+    # the tag is built once per manifest version
+    return _variant_tag(path, display_width, attrs, _mtime(MANIFEST_FILE), st.get_option("server.enableStaticServing"))
+
+@st.cache_resource(max_entries=MAX_CACHED_TAGS, show_spinner=False)
+def _variant_tag(path, display_width, attrs, manifest_mtime, static_serving):
+    entry = get_manifest()[path]
+    fallback = pick_variant(entry, display_width)
+    if not static_serving:
+        # Every srcset candidate would be inlined; ship just the best fit
+        return f'<img src="{asset_src(fallback["path"])}"{attrs}>'
+
+    sizes = f'sizes="{display_width}px"'
+    img = (
+        f'<img src="{asset_src(fallback["path"])}" srcset="{_srcset(entry["variants"], "webp")}" '
+        f'{sizes} width="{display_width}" loading="lazy"{attrs}>'
+    )
+    if not any(v["format"] == "avif" for v in entry["variants"]):
+        return img
+    return (
+        f'<picture><source type="image/avif" srcset="{_srcset(entry["variants"], "avif")}" {sizes}>'
+        f'{img}</picture>'
+    )
@@ -1,20 +1,29 @@
 import streamlit as st
-import pandas as pd
-from passlib.context import CryptContext
 import json
-from .database_setup import get_connection
-import base64
+import sqlite3
+from .database_setup import transaction
+from .assets import image_tag
+from . import pin_hasher
+from .pin_hasher import HasherBusy
+from .hash_policy import build_context
+from . import throttle
+from . import settings_cache
+from .metrics import timed
+from .user_ids import next_user_id
+from .throttle import Throttled
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import random
 from datetime import date
+from functools import lru_cache
 
-def get_base64_image(image_path):
-    try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except FileNotFoundError:
-        return ""
+LOGO_IMAGE = "assets/icon-192x192.png"
+LOGO_WIDTH = 80
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Rounds come from the calibrated policy (python -m modules.hash_policy).
+# Built on first use so passlib stays out of the startup imports.
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    return build_context()
 
 MCQ_QUESTIONS = [
     "What was the name of your first pet?",
@@ -36,144 +45,156 @@ SHORT_QUESTIONS = [
     "Who is your childhood hero?"
 ]
 
+BUSY_MSG = "Too many sign-ins right now. Please try again in a moment."
+THROTTLED_MSG = "Too many attempts. Please wait a minute and try again."
+
+# Both run on the bounded hashing pool and raise HasherBusy when it is full
+@timed("pin_hash")
 def hash_password(password):
-    return pwd_context.hash(password)
+    return pin_hasher.run(get_pwd_context().hash, password)
 
+@timed("pin_hash")
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return pin_hasher.run(get_pwd_context().verify, plain_password, hashed_password)
 
-def generate_user_id(name):
-    # Logic: Name-Number (e.g. Manoj-005)
-    conn = get_connection()
-    c = conn.cursor()
-    
-    first_name = name.split()[0].capitalize()
-    
-    # Count existing users to append a number
-    c.execute("SELECT COUNT(*) FROM users")
-    count = c.fetchone()[0] + 1
-    
-    user_id = f"{first_name}-{count:03d}" 
-    
-    # Ensure uniqueness
-    while True:
-        c.execute("SELECT user_id FROM users WHERE user_id = ?", (user_id,))
-        if not c.fetchone():
-            break
-        count += 1
-        user_id = f"{first_name}-{count:03d}"
-        
-    conn.close()
-    return user_id
+@timed("pin_hash")
+def verify_and_update_password(plain_password, hashed_password):
+    # (valid, new_hash); new_hash is set when the stored hash is outside policy
+    return pin_hasher.run(get_pwd_context().verify_and_update, plain_password, hashed_password)
 
-def register_user(name, username, email, mobile, dob, pin, security_data):
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Check username/email uniqueness
-    c.execute("SELECT username FROM users WHERE username = ?", (username,))
-    if c.fetchone():
-        conn.close()
-        return False, "Username already taken.", None
-        
-    c.execute("SELECT email FROM users WHERE email = ?", (email,))
-    if c.fetchone():
-        conn.close()
-        return False, "Email already registered.", None
+# IntegrityError column -> message shown on the sign-up form
+_UNIQUE_ERRORS = {
+    "users.username": "Username already taken.",
+    "users.email": "Email already registered.",
+}
 
-    user_id = generate_user_id(name)
-    pin_hash = hash_password(pin)
+def register_user(name, username, email, mobile, dob, pin, security_data):
+    try:
+        pin_hash = hash_password(pin)
+    except HasherBusy:
+        return False, BUSY_MSG, None
     security_questions_json = json.dumps(security_data)
+    # Email is optional; store NULL, not '', so the unique index allows many
+    email = (email or "").strip() or None
+
+    # One transaction: allocate the ID and insert, letting the UNIQUE
+    # constraints on username / email / user_id reject duplicates
+    try:
+        with transaction() as conn:
+            user_id = next_user_id(conn, name)
+            conn.execute('''
+                INSERT INTO users (username, name, email, mobile_number, dob, pin_hash, security_questions, user_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (username, name, email, mobile, str(dob), pin_hash, security_questions_json, user_id))
+    except sqlite3.IntegrityError as e:
+        return False, _UNIQUE_ERRORS.get(str(e).rsplit(" ", 1)[-1], "Registration failed, please try again."), None
     
-    c.execute('''
-        INSERT INTO users (username, name, email, mobile_number, dob, pin_hash, security_questions, user_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (username, name, email, mobile, str(dob), pin_hash, security_questions_json, user_id))
-    
-    conn.commit()
-    conn.close()
+    throttle.forget_unknown(username, email, user_id)
     return True, f"Registration Successful! Your User ID is: {user_id}", user_id
 
-def authenticate_user(identifier, pin):
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Allow login with either username or user_id
-    c.execute("SELECT pin_hash, username FROM users WHERE username = ? OR user_id = ?", (identifier, identifier))
-    result = c.fetchone()
-    conn.close()
+def _client_id():
+    # Best available key for the device: its IP where Streamlit exposes it,
+    # otherwise the browser session
+    ip = getattr(st.context, "ip_address", None)
+    if ip:
+        return ip
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+def authenticate_user(identifier, pin, client=None):
+    # Raises Throttled when the account or client is out of attempts
+    throttle.check(identifier, client)
+    if throttle.is_known_unknown(identifier):
+        return False, None
+
+    with transaction() as conn:
+        # Allow login with either username or user_id
+        result = conn.execute("SELECT pin_hash, username FROM users WHERE username = ? OR user_id = ?", (identifier, identifier)).fetchone()
     
-    if result and verify_password(pin, result[0]):
-        return True, result[1] # Return real username for session
-    return False, None
+    if not result:
+        throttle.remember_unknown(identifier)
+        return False, None
+    valid, new_hash = verify_and_update_password(pin, result[0])
+    if not valid:
+        return False, None
+    if new_hash:
+        # Stored rounds drifted from the calibrated policy: upgrade in place
+        with transaction() as conn:
+            conn.execute("UPDATE users SET pin_hash = ? WHERE username = ? AND pin_hash = ?", (new_hash, result[1], result[0]))
+    throttle.succeeded(client)
+    return True, result[1] # Return real username for session
 
-def get_security_questions(identifier):
+def get_security_questions(identifier, client=None):
     # Identifier can be user_id or email or username
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT security_questions, user_id, username FROM users WHERE user_id = ? OR email = ? OR username = ?", (identifier, identifier, identifier))
-    result = c.fetchone()
-    conn.close()
+    throttle.check(identifier, client)
+    if throttle.is_known_unknown(identifier):
+        return None, None, None
+
+    with transaction() as conn:
+        result = conn.execute("SELECT security_questions, user_id, username FROM users WHERE user_id = ? OR email = ? OR username = ?", (identifier, identifier, identifier)).fetchone()
     
     if result:
         return json.loads(result[0]), result[1], result[2]
+    throttle.remember_unknown(identifier)
     return None, None, None
 
 def reset_pin(username, new_pin):
-    conn = get_connection()
-    c = conn.cursor()
     pin_hash = hash_password(new_pin)
-    c.execute("UPDATE users SET pin_hash = ? WHERE username = ?", (pin_hash, username))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE users SET pin_hash = ? WHERE username = ?", (pin_hash, username))
     return True
 
 def change_pin(username, old_pin, new_pin):
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT pin_hash FROM users WHERE username = ?", (username,))
-    result = c.fetchone()
-    if not result or not verify_password(old_pin, result[0]):
-        conn.close()
-        return False, "Old PIN is incorrect."
+    with transaction() as conn:
+        result = conn.execute("SELECT pin_hash FROM users WHERE username = ?", (username,)).fetchone()
+    # Hash outside the transaction so the pooled connection isn't held meanwhile
+    try:
+        if not result or not verify_password(old_pin, result[0]):
+            return False, "Old PIN is incorrect."
+        new_hash = hash_password(new_pin)
+    except HasherBusy:
+        return False, BUSY_MSG
     
-    new_hash = hash_password(new_pin)
-    c.execute("UPDATE users SET pin_hash = ? WHERE username = ?", (new_hash, username))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE users SET pin_hash = ? WHERE username = ?", (new_hash, username))
     return True, "PIN changed successfully!"
 
 def update_user_setting(username, key, value):
-    conn = get_connection()
-    c = conn.cursor()
     if key not in ['hue', 'language']: return False
-    query = f"UPDATE users SET {key} = ? WHERE username = ?"
-    c.execute(query, (value, username))
-    conn.commit()
-    conn.close()
+    query = f"UPDATE users SET {key} = ?, settings_version = ? WHERE username = ?"
+    with transaction() as conn:
+        conn.execute("UPDATE settings_version SET version = version + 1 WHERE id = 1")
+        version = conn.execute("SELECT version FROM settings_version WHERE id = 1").fetchone()[0]
+        conn.execute(query, (value, version, username))
+    settings_cache.invalidate(username, version)
     return True
 
-def get_user_settings(username):
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT hue, language FROM users WHERE username = ?", (username,))
-    result = c.fetchone()
-    conn.close()
+def _load_user_settings(username):
+    with transaction() as conn:
+        result = conn.execute("SELECT hue, language FROM users WHERE username = ?", (username,)).fetchone()
     if result:
         return {"hue": result[0], "language": result[1]}
-    return {"hue": 0, "language": "en"}
+    return None
+
+@timed()
+def get_user_settings(username):
+    # Served from settings_cache on reruns; only a write to this user's
+    # settings (from any worker) or the TTL sends it back to the database
+    return settings_cache.get(username, _load_user_settings) or {"hue": 0, "language": "en"}
 
 def render_auth():
     # Centered Vertical Layout
-    logo_b64 = get_base64_image("assets/icon-192x192.png")
-    logo_src = f"data:image/png;base64,{logo_b64}" if logo_b64 else ""
+    logo_tag = image_tag(
+        LOGO_IMAGE, LOGO_WIDTH,
+        style="width: 80px; height: 80px; border-radius: 20px; box-shadow: 0 8px 30px rgba(255, 64, 129, 0.4); margin-bottom: 15px;"
+    )
 
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         st.markdown(f"""
         <div style='text-align: center;'>
             <div style='display: flex; flex-direction: column; align-items: center; justify-content: center; margin-bottom: 20px;'>
-                <img src='{logo_src}' style='width: 80px; height: 80px; border-radius: 20px; box-shadow: 0 8px 30px rgba(255, 64, 129, 0.4); margin-bottom: 15px;'>
+                {logo_tag}
                 <h1 style='font-size: 3rem; margin: 0; background: linear-gradient(to right, #ff4081, #ff80ab); -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>mahwari</h1>
             </div>
         </div>
@@ -187,13 +208,20 @@ def render_auth():
             login_pin = st.text_input("6-Digit PIN", type="password", max_chars=6, key="login_pin", placeholder="• • • • • •")
             
             if st.button("Unlock", key="btn_login", use_container_width=True):
-                success, real_username = authenticate_user(login_id, login_pin)
+                try:
+                    success, real_username = authenticate_user(login_id, login_pin, _client_id())
+                except HasherBusy:
+                    st.warning(BUSY_MSG)
+                    success = None
+                except Throttled:
+                    st.warning(THROTTLED_MSG)
+                    success = None
                 if success:
                     st.session_state["authenticated"] = True
                     st.session_state["username"] = real_username
                     st.success("Sign In Successful!")
                     st.rerun()
-                else:
+                elif success is not None:
                     st.error("Invalid Username/ID or PIN")
 
         with tab2:
@@ -285,13 +313,17 @@ def render_auth():
             st.markdown("<h3 style='text-align: center;'>Recover PIN</h3>", unsafe_allow_html=True)
             forgot_input = st.text_input("Enter Username, User ID, or Email")
             if st.button("Find User", use_container_width=True):
-                questions, found_uid, found_uname = get_security_questions(forgot_input)
-                if questions:
-                    st.session_state["recovery_questions"] = questions
-                    st.session_state["recovery_uid"] = found_uid
-                    st.session_state["recovery_uname"] = found_uname
+                try:
+                    questions, found_uid, found_uname = get_security_questions(forgot_input, _client_id())
+                except Throttled:
+                    st.warning(THROTTLED_MSG)
                 else:
-                    st.error("User not found.")
+                    if questions:
+                        st.session_state["recovery_questions"] = questions
+                        st.session_state["recovery_uid"] = found_uid
+                        st.session_state["recovery_uname"] = found_uname
+                    else:
+                        st.error("User not found.")
             
             if "recovery_questions" in st.session_state:
                 q_data = st.session_state["recovery_questions"]
@@ -330,10 +362,14 @@ def render_auth():
                         if ra6 == q_data['a6']: correct_count += 1
                         
                         if correct_count >= 5:
-                            reset_pin(st.session_state["recovery_uname"], new_pin_reset)
-                            st.success("PIN Reset Successful!")
-                            st.info(f"Your User ID is: **{st.session_state['recovery_uid']}**")
-                            del st.session_state["recovery_questions"]
+                            try:
+                                reset_pin(st.session_state["recovery_uname"], new_pin_reset)
+                            except HasherBusy:
+                                st.warning(BUSY_MSG)
+                            else:
+                                st.success("PIN Reset Successful!")
+                                st.info(f"Your User ID is: **{st.session_state['recovery_uid']}**")
+                                del st.session_state["recovery_questions"]
                         else:
                             st.error(f"Only {correct_count}/6 correct. You need at least 5 correct answers.")
 
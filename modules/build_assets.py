@@ -0,0 +1,96 @@
+"""
+Offline asset build step.
+
+Generates resized WebP (and AVIF, when Pillow supports it) variants of the
+exercise and auth images into ./static together with a manifest that
+modules.assets reads at render time to pick the smallest suitable file.
+
+    python -m modules.build_assets            # build variants + manifest
+    python -m modules.build_assets --report   # bytes shipped per page, before/after
+"""
+import argparse
+import json
+import os
+
+from .assets import STATIC_DIR, MANIFEST_FILE, pick_variant
+from .auth import LOGO_IMAGE, LOGO_WIDTH
+from .health_data import EXERCISE_SECTIONS, EXERCISE_IMG_WIDTH
+
+# (image, displayed CSS width) for each page that shows them
+PAGE_IMAGES = {
+    "auth": [(LOGO_IMAGE, LOGO_WIDTH)],
+    "health": [(item["img"], EXERCISE_IMG_WIDTH) for section in EXERCISE_SECTIONS for item in section["items"]],
+}
+
+SOURCE_IMAGES = sorted({img for images in PAGE_IMAGES.values() for img, _ in images})
+
+# Target widths in CSS pixels * device pixel ratio; the images are shown at
+# 60-80px so anything above 256px is never picked.
+VARIANT_WIDTHS = (64, 128, 192, 256)
+FORMATS = {"webp": {"quality": 80, "method": 6}, "avif": {"quality": 60}}
+
+def _supported_formats():
+    from PIL import features
+    supported = ["webp"] if features.check("webp") else []
+    if "avif" in features.get_supported_modules() and features.check("avif"):
+        supported.append("avif")
+    return supported
+
+def build(sources=SOURCE_IMAGES, widths=VARIANT_WIDTHS, out_dir=STATIC_DIR):
+    from PIL import Image
+
+    os.makedirs(out_dir, exist_ok=True)
+    formats = _supported_formats()
+    manifest = {}
+
+    for src in sources:
+        if not os.path.exists(src):
+            print(f"skip {src}: not found")
+            continue
+        stem = os.path.splitext(os.path.basename(src))[0]
+        with Image.open(src) as img:
+            img = img.convert("RGBA")
+            entry = {"width": img.width, "height": img.height, "bytes": os.path.getsize(src), "variants": []}
+            for w in widths:
+                if w > img.width:
+                    break
+                h = round(img.height * w / img.width)
+                resized = img.resize((w, h), Image.LANCZOS)
+                for fmt in formats:
+                    out = os.path.join(out_dir, f"{stem}-{w}w.{fmt}")
+                    resized.save(out, fmt.upper(), **FORMATS[fmt])
+                    entry["variants"].append({"path": out, "width": w, "format": fmt, "bytes": os.path.getsize(out)})
+        manifest[src] = entry
+        print(f"{src}: {len(entry['variants'])} variants")
+
+    with open(os.path.join(out_dir, os.path.basename(MANIFEST_FILE)), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def report(manifest_path=MANIFEST_FILE):
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    print(f"{'page':<10}{'before (inline b64)':>22}{'after':>12}")
+    for page, images in PAGE_IMAGES.items():
+        before = after = 0
+        for img, display_width in images:
+            entry = manifest.get(img)
+            original = entry["bytes"] if entry else os.path.getsize(img)
+            # base64 inflates the payload by 4/3
+            before += (original + 2) // 3 * 4
+            variant = pick_variant(entry, display_width) if entry else None
+            after += variant["bytes"] if variant else (original + 2) // 3 * 4
+        print(f"{page:<10}{before:>22,}{after:>12,}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build resized image variants for the app.")
+    parser.add_argument("--report", action="store_true", help="print bytes shipped per page and exit")
+    args = parser.parse_args()
+    if args.report:
+        report()
+    else:
+        build()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Translation catalog check.
+
+Validates the catalogs in assets/i18n against English and against the keys
+the code looks up (t[...] in app.py and modules/). Exits with status 1 on
+errors so it can gate a deploy.
+
+    python -m modules.build_translations            # errors: bad/missing catalogs, unknown keys
+    python -m modules.build_translations --strict   # also fail on untranslated keys
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+
+from .translations import CATALOG_DIR, DEFAULT_LANG, LANG_NAMES, catalog_path, read_catalog
+
+SOURCES = ["app.py", "modules/*.py"]
+KEY_PATTERN = re.compile(r"""\bt\[['"](\w+)['"]\]""")
+
+def used_keys():
+    keys = {}
+    for pattern in SOURCES:
+        for path in glob.glob(pattern):
+            with open(path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, start=1):
+                    for key in KEY_PATTERN.findall(line):
+                        keys.setdefault(key, f"{path}:{line_no}")
+    return keys
+
+def load_catalogs(errors):
+    catalogs = {}
+    for lang in LANG_NAMES:
+        try:
+            strings = read_catalog(lang)
+        except OSError:
+            errors.append(f"{lang}: missing {catalog_path(lang)}")
+            continue
+        except ValueError as e:
+            errors.append(f"{lang}: invalid JSON ({e})")
+            continue
+        if not isinstance(strings, dict) or not all(isinstance(v, str) for v in strings.values()):
+            errors.append(f"{lang}: catalog must be an object of strings")
+            continue
+        catalogs[lang] = strings
+
+    for path in glob.glob(os.path.join(CATALOG_DIR, "*.json")):
+        lang = os.path.splitext(os.path.basename(path))[0]
+        if lang not in LANG_NAMES:
+            errors.append(f"{lang}: catalog not listed in translations.LANG_NAMES")
+    return catalogs
+
+def check(strict=False):
+    errors, warnings = [], []
+    catalogs = load_catalogs(errors)
+    english = catalogs.get(DEFAULT_LANG, {})
+
+    for key, where in sorted(used_keys().items()):
+        if key not in english:
+            errors.append(f"{where}: t['{key}'] has no English string")
+
+    print(f"{'lang':<6}{'keys':>6}{'coverage':>10}{'bytes':>8}")
+    for lang, strings in catalogs.items():
+        missing = sorted(set(english) - set(strings))
+        extra = sorted(set(strings) - set(english))
+        coverage = 1 - len(missing) / len(english) if english else 0
+        print(f"{lang:<6}{len(strings):>6}{coverage:>10.0%}{os.path.getsize(catalog_path(lang)):>8}")
+        if extra:
+            errors.append(f"{lang}: keys not in English: {', '.join(extra)}")
+        if missing:
+            (errors if strict else warnings).append(f"{lang}: untranslated, falls back to English: {', '.join(missing)}")
+
+    for message in warnings:
+        print(f"warning: {message}")
+    for message in errors:
+        print(f"error: {message}")
+    return not errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate translation catalogs.")
+    parser.add_argument("--strict", action="store_true", help="treat untranslated keys as errors")
+    args = parser.parse_args()
+    sys.exit(0 if check(args.strict) else 1)
+
+if __name__ == "__main__":
+    main()
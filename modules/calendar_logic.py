@@ -1,45 +1,73 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta, date
 import calendar
-import plotly.figure_factory as ff
+from functools import lru_cache
+from .database_setup import transaction
+from .cycle_stats import load_stats, record_cycle
+from .cycle_model import CycleSeries
+from .assets import get_text_asset
+from .metrics import timed
 
 def save_cycle(username, start_date, end_date):
-    from .database_setup import get_connection
-    conn = get_connection()
-    c = conn.cursor()
     # Updated to store duration for PCOD logic
     duration = (end_date - start_date).days + 1
-    c.execute("INSERT INTO cycles (username, start_date, end_date, duration) VALUES (?, ?, ?, ?)", 
-              (username, str(start_date), str(end_date), duration))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("INSERT INTO cycles (username, start_date, end_date, duration) VALUES (?, ?, ?, ?)", 
+                     (username, str(start_date), str(end_date), duration))
+        record_cycle(conn, username, start_date)
 
+@timed()
 def get_user_cycles(username):
-    from .database_setup import get_connection
-    conn = get_connection()
-    df = pd.read_sql("SELECT * FROM cycles WHERE username = ?", conn, params=(username,))
-    conn.close()
+    # DataFrame for display (history table / chart); per-request logic
+    # should use get_cycle_stats or get_cycles_in_range instead.
+    import pandas as pd
+    with transaction() as conn:
+        df = pd.read_sql("SELECT * FROM cycles WHERE username = ?", conn, params=(username,))
     return df
 
-def predict_next_period(cycles_df):
-    if cycles_df.empty:
+def get_cycles_in_range(username, first_day, last_day):
+    # Only the cycles overlapping [first_day, last_day], as CycleSeries
+    with transaction() as conn:
+        rows = conn.execute(
+            "SELECT id, start_date, end_date, duration FROM cycles "
+            "WHERE username = ? AND end_date >= ? AND start_date <= ? ORDER BY start_date",
+            (username, str(first_day), str(last_day))
+        ).fetchall()
+    return CycleSeries.from_rows(rows)
+
+def period_day_mask(series, first_day, num_days):
+    """
+    Boolean array with one entry per day from first_day, True on period days.
+    Each cycle adds +1 at its (clipped) start and -1 after its end; a cumulative
+    sum then marks every covered day without walking the ranges in Python.
+    """
+    import numpy as np
+    if series.empty:
+        return np.zeros(num_days, dtype=bool)
+    offset = first_day.toordinal()
+    starts = np.clip(np.asarray(series.starts, dtype=np.int64) - offset, 0, num_days)
+    ends = np.clip(np.asarray(series.ends, dtype=np.int64) - offset + 1, 0, num_days)
+    edges = np.bincount(starts, minlength=num_days + 1) - np.bincount(ends, minlength=num_days + 1)
+    return np.cumsum(edges[:num_days]) > 0
+
+@timed()
+def get_cycle_stats(username):
+    with transaction() as conn:
+        return load_stats(conn, username)
+
+@timed()
+def predict_next_period(stats):
+    # stats: running aggregates from get_cycle_stats (see modules/cycle_stats.py)
+    if not stats or not stats["cycle_count"]:
         return None
     # Simple logic: Average cycle length or default 28
     # Needed: Start date of last cycle + 28 days
-    last_cycle = cycles_df.iloc[-1]
-    last_start = datetime.strptime(last_cycle['start_date'], '%Y-%m-%d').date()
+    last_start = date.fromisoformat(stats["last_start"])
     
-    # Calculate average cycle length if enough data
+    # Average cycle length once there are at least two starts
     avg_length = 28
-    if len(cycles_df) > 1:
-        # Sort by date
-        cycles_df['start_date'] = pd.to_datetime(cycles_df['start_date'])
-        cycles_df = cycles_df.sort_values('start_date')
-        
-        diffs = cycles_df['start_date'].diff().dt.days.dropna()
-        if not diffs.empty:
-            avg_length = int(diffs.mean())
+    if stats["gap_count"]:
+        avg_length = int(stats["gap_mean"])
     
     next_date = last_start + timedelta(days=avg_length)
     return next_date
@@ -49,60 +77,67 @@ def render_calendar_plot(cycles_df, predicted_date):
     # But keeping empty return to avoid import errors if called elsewhere before update
     return {}
 
-def render_cycle_chart(cycles_df):
+MONTH_NAMES = list(calendar.month_name)
+CHART_CACHE_ENTRIES = 256
+
+def cycles_version(cycles_df):
+    # Cycles are only ever inserted (ids autoincrement), so row count plus
+    # the newest id identifies a user's history without hashing it.
+    return len(cycles_df), int(cycles_df['id'].max())
+
+@timed()
+def render_cycle_chart(cycles_df, username=None):
     if cycles_df.empty:
         return None
-    
+    if username is None:
+        return build_cycle_chart(cycles_df)
+    return _cached_cycle_chart(username, cycles_version(cycles_df), cycles_df)
+
+@st.cache_resource(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def _cached_cycle_chart(username, version, _cycles_df):
+    # Keyed on (username, version) only; st.plotly_chart serialises a copy
+    # of the figure, so sharing the cached object between reruns is safe.
+    return build_cycle_chart(_cycles_df)
+
+def build_cycle_chart(cycles_df):
+    import numpy as np
+    import pandas as pd
     import plotly.graph_objects as go
-    
-    # Prepare Data
-    df = cycles_df.copy()
-    
-    # Normalize dates
-    df['start_date'] = pd.to_datetime(df['start_date'])
-    df['end_date'] = pd.to_datetime(df['end_date'])
-    
-    # Calculate Duration and Month key for merging
-    df['duration'] = (df['end_date'] - df['start_date']).dt.days + 1
-    df['month_dt'] = df['start_date'].dt.to_period('M').dt.to_timestamp()
-    
-    # Generate full range of months
-    min_date = df['month_dt'].min()
-    max_date = df['month_dt'].max()
-    full_range = pd.date_range(start=min_date, end=max_date, freq='MS')
-    
-    df_full = pd.DataFrame({'month_dt': full_range})
-    
-    # Merge to keep all months
-    merged = pd.merge(df_full, df, on='month_dt', how='left')
-    
-    # Fill Nans
-    merged['duration'] = merged['duration'].fillna(0)
-    merged['start_date'] = merged['start_date'].fillna(merged['month_dt']) # Just for hover stability if needed
-    merged['end_date'] = merged['end_date'].fillna(merged['month_dt'])
-    
-    merged['month_label'] = merged['month_dt'].dt.strftime('%B %Y')
-    
-    # Separate loops for hover text handling to avoid errors on NaNs
-    def build_hover(row):
-        if row['duration'] == 0:
-            return "No Data"
-        return (
-            "Start: " + row['start_date'].strftime('%d/%m/%Y') + "<br>" +
-            "End: " + row['end_date'].strftime('%d/%m/%Y') + "<br>" +
-            "Duration: " + str(int(row['duration'])) + " days"
-        )
-    
-    merged['hover_text'] = merged.apply(build_hover, axis=1)
+
+    starts = pd.to_datetime(cycles_df['start_date']).to_numpy(dtype='datetime64[D]')
+    ends = pd.to_datetime(cycles_df['end_date']).to_numpy(dtype='datetime64[D]')
+    durations = (ends - starts).astype(np.int64) + 1
+    months = starts.astype('datetime64[M]')
+
+    # One bar per cycle plus a "No Data" bar for every month in the range
+    # without one, in month order (cycles in the same month keep DB order)
+    all_months = np.arange(months.min(), months.max() + 1)
+    empty = np.setdiff1d(all_months, months)
+    bar_months = np.concatenate([months, empty])
+    order = np.argsort(bar_months, kind='stable')
+    bar_months = bar_months[order]
+    bar_durations = np.concatenate([durations, np.zeros(len(empty), dtype=np.int64)])[order]
+
+    # Hover text from ISO strings (YYYY-MM-DD -> DD/MM/YYYY) with vectorised string ops
+    start_iso = pd.Series(np.datetime_as_string(starts, unit='D'))
+    end_iso = pd.Series(np.datetime_as_string(ends, unit='D'))
+    cycle_hover = (
+        "Start: " + start_iso.str[8:10] + "/" + start_iso.str[5:7] + "/" + start_iso.str[:4] + "<br>"
+        + "End: " + end_iso.str[8:10] + "/" + end_iso.str[5:7] + "/" + end_iso.str[:4] + "<br>"
+        + "Duration: " + pd.Series(durations).astype(str) + " days"
+    ).to_numpy(dtype=object)
+    hover = np.concatenate([cycle_hover, np.full(len(empty), "No Data", dtype=object)])[order]
+
+    # "%B %Y" month labels
+    month_num = bar_months.astype(np.int64)
+    labels = np.array(MONTH_NAMES, dtype=object)[month_num % 12 + 1] + " " + (month_num // 12 + 1970).astype(str).astype(object)
 
     fig = go.Figure(data=[
         go.Bar(
-            x=merged['month_label'], 
-            y=merged['duration'], 
+            x=labels,
+            y=bar_durations,
             marker_color='#ff4081',
-            # text=merged['duration'],  <-- Removed as requested
-            # textposition='auto',      <-- Removed as requested
-            hovertext=merged['hover_text'],
+            hovertext=hover,
             hoverinfo="text"
         )
     ])
@@ -120,7 +155,42 @@ def render_cycle_chart(cycles_df):
     )
     return fig
 
-def render_monthly_calendar(cycles_df, predicted_date):
+CALENDAR_CSS = "assets/calendar.css"
+WEEKDAY_HEADERS = "".join(f'<div class="cal-header">{day}</div>' for day in ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"])
+EMPTY_CELL = '<div class="cal-cell is-empty"></div>'
+PERIOD_MARK = '<span class="period-mark">🩸</span>'
+PREDICTED_MARK = '<span style="font-size:0.7em; color:#ffaaaa;">Est.</span>'
+
+@lru_cache(maxsize=48)
+def month_skeleton(year, month):
+    # Day number per grid cell (0 = padding) for a (year, month); only the
+    # per-user markers change between reruns, so the layout is computed once.
+    return tuple(day for week in calendar.monthcalendar(year, month) for day in week)
+
+def build_month_html(year, month, period_mask, predicted_date, today):
+    predicted_day = predicted_date.day if predicted_date and (predicted_date.year, predicted_date.month) == (year, month) else 0
+    today_day = today.day if (today.year, today.month) == (year, month) else 0
+
+    cells = []
+    for day in month_skeleton(year, month):
+        if day == 0:
+            cells.append(EMPTY_CELL)
+            continue
+        
+        # Logic
+        if period_mask[day - 1]:
+            classes, content = "cal-cell is-period", PERIOD_MARK
+        elif day == predicted_day:
+            classes, content = "cal-cell is-predicted", PREDICTED_MARK
+        elif day == today_day:
+            classes, content = "cal-cell is-today", ""
+        else:
+            classes, content = "cal-cell", ""
+        cells.append(f'<div class="{classes}"><span class="day-num">{day}</span><div class="dot-container">{content}</div></div>')
+
+    return f'<div class="modern-calendar">{WEEKDAY_HEADERS}{"".join(cells)}</div>'
+
+def render_monthly_calendar(username, predicted_date):
     # Modern CSS Grid Calendar
     today = datetime.today().date()
     
@@ -157,169 +227,13 @@ def render_monthly_calendar(cycles_df, predicted_date):
             st.rerun()
     
     # Data Processing
-    period_days = set()
-    if not cycles_df.empty:
-        temp_df = cycles_df.copy()
-        temp_df['start_date'] = pd.to_datetime(temp_df['start_date'])
-        temp_df['end_date'] = pd.to_datetime(temp_df['end_date'])
-        
-        for index, row in temp_df.iterrows():
-            s = row['start_date'].date()
-            e = row['end_date'].date()
-            curr = s
-            while curr <= e:
-                period_days.add(curr)
-                curr += timedelta(days=1)
+    num_days = calendar.monthrange(year, month)[1]
+    first_day = date(year, month, 1)
+    month_cycles = get_cycles_in_range(username, first_day, date(year, month, num_days))
+    period_mask = period_day_mask(month_cycles, first_day, num_days)
 
     # Calendar Construction
-    cal = calendar.monthcalendar(year, month)
-    days = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
-    
-    html = """
-    <style>
-        .modern-calendar {
-            display: grid;
-            grid-template-columns: repeat(7, 1fr);
-            gap: 8px;
-            margin-top: 15px;
-            font-family: 'Outfit', sans-serif;
-        }
-        
-        .cal-header {
-            text-align: center;
-            font-size: 0.85em;
-            color: #888;
-            font-weight: 600;
-            padding-bottom: 5px;
-        }
-        
-        .cal-cell {
-            aspect-ratio: 1 / 1; /* Perfect squares */
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(8px);
-            -webkit-backdrop-filter: blur(8px);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 12px;
-            display: flex;
-            flex-direction: column;
-            justify-content: flex-start;
-            align-items: center;
-            padding: 5px;
-            position: relative;
-            cursor: pointer;
-            transition: all 0.3s cubic-bezier(0.25, 0.8, 0.25, 1);
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        
-        .cal-cell:hover {
-            transform: translateY(-5px) scale(1.05);
-            background: rgba(255, 255, 255, 0.15);
-            border-color: rgba(255, 255, 255, 0.4);
-            box-shadow: 0 10px 20px rgba(0,0,0,0.2);
-            z-index: 2;
-        }
-        
-        .day-num {
-            font-size: 0.9em;
-            font-weight: 500;
-            margin-bottom: 2px;
-        }
-        
-        .dot-container {
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            height: 100%;
-            width: 100%;
-        }
-        
-        /* Variants */
-        .is-empty {
-            background: transparent;
-            border: none;
-            cursor: default;
-        }
-        .is-empty:hover {
-            transform: none;
-            background: transparent;
-        }
-        
-        .is-period {
-            background: rgba(255, 64, 129, 0.25);
-            border-color: #ff4081;
-            box-shadow: 0 0 10px rgba(255, 64, 129, 0.2);
-        }
-        
-        .is-predicted {
-            background: rgba(255, 80, 80, 0.15);
-            border-color: #ff5050;
-            border-style: dashed;
-        }
-        
-        .is-today {
-            border: 2px solid #00c6ff;
-            background: rgba(0, 198, 255, 0.1);
-        }
-        
-        .period-mark {
-            font-size: 1.5rem;
-            line-height: 1;
-            filter: drop-shadow(0 2px 4px rgba(0,0,0,0.3));
-            animation: pulse 2s infinite;
-        }
-        
-        @keyframes pulse {
-            0% { transform: scale(1); }
-            50% { transform: scale(1.1); }
-            100% { transform: scale(1); }
-        }
-        
-        /* Mobile adjustment */
-        @media (max-width: 600px) {
-            .modern-calendar { gap: 4px; }
-            .cal-cell { border-radius: 8px; padding: 2px; }
-            .day-num { font-size: 0.75em; }
-            .period-mark { font-size: 1.2rem; }
-        }
-    </style>
-    
-    <div class="modern-calendar">
-    """
-    
-    # Add Headers
-    for day in days:
-        html += f'<div class="cal-header">{day}</div>'
-        
-    # Add Days
-    for week in cal:
-        for day in week:
-            if day == 0:
-                html += '<div class="cal-cell is-empty"></div>'
-                continue
-            
-            d_date = date(year, month, day)
-            
-            # Logic
-            classes = ["cal-cell"]
-            content = ""
-            
-            if d_date in period_days:
-                classes.append("is-period")
-                content = '<span class="period-mark">🩸</span>'
-            elif predicted_date and d_date == predicted_date:
-                classes.append("is-predicted")
-                content = '<span style="font-size:0.7em; color:#ffaaaa;">Est.</span>'
-            elif d_date == today:
-                classes.append("is-today")
-            
-            html += f"""
-            <div class="{' '.join(classes)}">
-                <span class="day-num">{day}</span>
-                <div class="dot-container">{content}</div>
-            </div>
-            """
-            
-    html += "</div>"
+    html = build_month_html(year, month, period_mask, predicted_date, today)
     
     # Legend
     legend = """
@@ -338,4 +252,4 @@ def render_monthly_calendar(cycles_df, predicted_date):
         </div>
     </div>
     """
-    st.markdown(html + legend, unsafe_allow_html=True)
+    st.markdown(f"<style>{get_text_asset(CALENDAR_CSS)}</style>" + html + legend, unsafe_allow_html=True)
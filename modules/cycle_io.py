@@ -0,0 +1,198 @@
+"""
+Bulk cycle import / export for users moving from other trackers.
+
+Imports stream the file in chunks: each chunk is validated, its durations
+computed in one NumPy pass, and inserted with executemany in its own
+transaction. Unparseable rows and start dates already on record are
+skipped and reported rather than aborting the import. Exports write straight from a cursor, never building a
+DataFrame.
+
+Accepted input: CSV with start_date,end_date columns, JSON Lines with the
+same keys, or a JSON array of such objects. Dates are YYYY-MM-DD or
+DD/MM/YYYY.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from .database_setup import transaction
+from .cycle_stats import rebuild_stats
+
+CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 20
+EXPORT_COLUMNS = ("start_date", "end_date", "duration")
+FORMATS = ("csv", "jsonl", "json")
+
+def _parse_date(value):
+    value = (value or "").strip()
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return datetime.strptime(value, "%d/%m/%Y").date()
+
+class Rejected:
+    """Stands in for a record that could not be parsed. A fatal one ends the file."""
+
+    def __init__(self, reason, fatal=False):
+        self.reason = reason
+        self.fatal = fatal
+
+def _iter_records(stream, fmt):
+    # Yields record dicts, or a Rejected for input that doesn't parse, so one
+    # bad line never aborts the rows around it
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            while True:
+                try:
+                    record = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    record = Rejected(f"unreadable CSV row ({e})")
+                yield record
+        elif fmt == "jsonl":
+            for line in stream:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except UnicodeDecodeError:
+                    raise
+                except ValueError:
+                    record = Rejected("invalid JSON")
+                yield record
+        else:
+            # A plain JSON array has to be parsed whole
+            try:
+                records = json.load(stream)
+            except UnicodeDecodeError:
+                raise
+            except ValueError as e:
+                yield Rejected(f"not a valid JSON file ({e})", fatal=True)
+                return
+            if not isinstance(records, list):
+                yield Rejected("expected a JSON array of records", fatal=True)
+                return
+            yield from records
+    except UnicodeDecodeError:
+        yield Rejected("file is not UTF-8 text; stopped reading there", fatal=True)
+
+def detect_format(filename):
+    name = filename.lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".json"):
+        return "json"
+    return "csv"
+
+def _validate_chunk(records, first_line, errors):
+    import numpy as np
+    starts, ends = [], []
+    today = date.today()
+    for line, record in enumerate(records, start=first_line):
+        if isinstance(record, Rejected):
+            if not record.fatal:
+                errors.append(f"Row {line}: {record.reason}")
+            continue
+        try:
+            start = _parse_date(record.get("start_date"))
+            end = _parse_date(record.get("end_date"))
+        except (ValueError, AttributeError):
+            errors.append(f"Row {line}: invalid or missing date")
+            continue
+        if end < start:
+            errors.append(f"Row {line}: end date before start date")
+            continue
+        if start > today:
+            errors.append(f"Row {line}: start date in the future")
+            continue
+        starts.append(start.toordinal())
+        ends.append(end.toordinal())
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+def import_cycles(username, stream, fmt="csv", chunk_size=CHUNK_SIZE):
+    """
+    Imports cycles for username from a text stream.
+
+    Rows that don't parse or validate are skipped, as are cycles whose start
+    date is already in the user's history, so importing a file twice adds
+    nothing. Returns {"imported": int, "skipped": int, "duplicates": int,
+    "errors": [first few messages], "failed": message if reading stopped
+    early, else None}.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    records = _iter_records(stream, fmt)
+    errors = []
+    imported = skipped = duplicates = 0
+    failed = None
+    line = 1
+    try:
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            fatal = [r for r in chunk if isinstance(r, Rejected) and r.fatal]
+            if fatal:
+                failed = fatal[0].reason
+            error_count = len(errors)
+            starts, ends = _validate_chunk(chunk, line, errors)
+            line += len(chunk)
+            skipped += len(errors) - error_count
+            del errors[MAX_REPORTED_ERRORS:]
+            if not len(starts):
+                continue
+
+            durations = ends - starts + 1
+            rows = [
+                (username, start, end, duration, username, start)
+                for start, end, duration in zip(
+                    (date.fromordinal(int(s)).isoformat() for s in starts),
+                    (date.fromordinal(int(e)).isoformat() for e in ends),
+                    durations.tolist(),
+                )
+            ]
+            with transaction() as conn:
+                before = conn.total_changes
+                # Skips start dates already stored, including earlier rows of this file
+                conn.executemany(
+                    "INSERT INTO cycles (username, start_date, end_date, duration) SELECT ?, ?, ?, ? "
+                    "WHERE NOT EXISTS (SELECT 1 FROM cycles WHERE username = ? AND start_date = ?)",
+                    rows
+                )
+                inserted = conn.total_changes - before
+            imported += inserted
+            duplicates += len(rows) - inserted
+    finally:
+        if imported:
+            # Imported history can land anywhere in the timeline: rebuild once,
+            # even if a later chunk failed
+            with transaction() as conn:
+                rebuild_stats(conn, username)
+    return {"imported": imported, "skipped": skipped, "duplicates": duplicates, "errors": errors, "failed": failed}
+
+def export_cycles(username, out, fmt="csv", batch_size=CHUNK_SIZE):
+    """Writes username's cycles to the text stream out (CSV or JSON Lines), oldest first."""
+    with transaction() as conn:
+        cursor = conn.execute(
+            f"SELECT {', '.join(EXPORT_COLUMNS)} FROM cycles WHERE username = ? ORDER BY start_date", (username,)
+        )
+        writer = csv.writer(out) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            if writer:
+                writer.writerows(batch)
+            else:
+                out.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in batch)
+
+def export_cycles_text(username, fmt="csv"):
+    out = io.StringIO()
+    export_cycles(username, out, fmt)
+    return out.getvalue()
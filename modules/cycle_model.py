@@ -0,0 +1,64 @@
+from array import array
+from datetime import date
+
+# Lightweight typed records for the per-request paths (prediction, calendar),
+# so they don't need pandas. DataFrames are only built where a table or
+# chart is actually displayed (see calendar_logic.get_user_cycles).
+
+class Cycle:
+    __slots__ = ("id", "start", "end", "duration")
+
+    def __init__(self, id, start, end, duration=None):
+        self.id = id
+        self.start = start
+        self.end = end
+        self.duration = duration if duration is not None else (end - start).days + 1
+
+    @classmethod
+    def from_row(cls, row):
+        # row: (id, start_date, end_date, duration) as stored in the cycles table
+        cycle_id, start, end, duration = row
+        return cls(cycle_id, date.fromisoformat(start[:10]), date.fromisoformat(end[:10]), duration)
+
+    def __repr__(self):
+        return f"Cycle({self.start} -> {self.end}, {self.duration} days)"
+
+class CycleSeries:
+    """
+    A user's cycles as two compact arrays of proleptic ordinal days
+    (date.toordinal()), sorted by start date.
+    """
+    __slots__ = ("ids", "starts", "ends")
+
+    def __init__(self, cycles=()):
+        cycles = sorted(cycles, key=lambda c: c.start)
+        self.ids = array("q", (c.id or 0 for c in cycles))
+        self.starts = array("l", (c.start.toordinal() for c in cycles))
+        self.ends = array("l", (c.end.toordinal() for c in cycles))
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls(Cycle.from_row(row) for row in rows)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        for cycle_id, s, e in zip(self.ids, self.starts, self.ends):
+            yield Cycle(cycle_id, date.fromordinal(s), date.fromordinal(e))
+
+    @property
+    def empty(self):
+        return not self.starts
+
+    def last_start(self):
+        return date.fromordinal(self.starts[-1]) if self.starts else None
+
+    def gaps(self):
+        # Cycle lengths: days between consecutive start dates
+        starts = self.starts
+        return array("l", (b - a for a, b in zip(starts, starts[1:])))
+
+    def mean_gap(self):
+        gaps = self.gaps()
+        return sum(gaps) / len(gaps) if gaps else None
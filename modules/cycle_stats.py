@@ -0,0 +1,72 @@
+from datetime import date
+
+# Running per-user aggregates over cycle lengths (days between consecutive
+# start dates), kept in the cycle_stats table and updated as cycles are saved
+# so prediction / risk never need to reload the full history.
+#
+# Mean and variance use Welford's online algorithm: gap_m2 is the running sum
+# of squared deviations, so sample variance = gap_m2 / (gap_count - 1).
+
+COLUMNS = ("cycle_count", "first_start", "last_start", "gap_count", "gap_mean", "gap_m2", "gap_min", "gap_max")
+
+def _ordinal(value):
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+def _empty():
+    return {"cycle_count": 0, "first_start": None, "last_start": None,
+            "gap_count": 0, "gap_mean": 0.0, "gap_m2": 0.0, "gap_min": None, "gap_max": None}
+
+def _add_start(stats, start):
+    start = str(start)[:10]
+    if stats["last_start"] is not None:
+        gap = _ordinal(start) - _ordinal(stats["last_start"])
+        stats["gap_count"] += 1
+        delta = gap - stats["gap_mean"]
+        stats["gap_mean"] += delta / stats["gap_count"]
+        stats["gap_m2"] += delta * (gap - stats["gap_mean"])
+        stats["gap_min"] = gap if stats["gap_min"] is None else min(stats["gap_min"], gap)
+        stats["gap_max"] = gap if stats["gap_max"] is None else max(stats["gap_max"], gap)
+    stats["cycle_count"] += 1
+    stats["first_start"] = stats["first_start"] or start
+    stats["last_start"] = start
+
+def _save(conn, username, stats):
+    conn.execute(
+        f"INSERT OR REPLACE INTO cycle_stats (username, {', '.join(COLUMNS)}) VALUES (?{', ?' * len(COLUMNS)})",
+        (username, *(stats[col] for col in COLUMNS))
+    )
+
+def load_stats(conn, username):
+    row = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM cycle_stats WHERE username = ?", (username,)).fetchone()
+    return dict(zip(COLUMNS, row)) if row else None
+
+def rebuild_stats(conn, username):
+    stats = _empty()
+    for (start,) in conn.execute("SELECT start_date FROM cycles WHERE username = ? ORDER BY start_date", (username,)):
+        _add_start(stats, start)
+    _save(conn, username, stats)
+    return stats
+
+def rebuild_all_stats(conn):
+    users = [row[0] for row in conn.execute("SELECT DISTINCT username FROM cycles")]
+    for username in users:
+        rebuild_stats(conn, username)
+
+def record_cycle(conn, username, start_date):
+    """
+    Folds a newly inserted cycle into the user's aggregates (same transaction
+    as the insert). Back-filled cycles that start before the latest one
+    change which gaps exist, so those fall back to a rebuild.
+    """
+    stats = load_stats(conn, username)
+    if stats is None or (stats["last_start"] and str(start_date)[:10] < stats["last_start"]):
+        return rebuild_stats(conn, username)
+    _add_start(stats, start_date)
+    _save(conn, username, stats)
+    return stats
+
+def gap_std(stats):
+    # Sample standard deviation (ddof=1, as pandas .std()); None below 2 gaps
+    if not stats or stats["gap_count"] < 2:
+        return None
+    return (stats["gap_m2"] / (stats["gap_count"] - 1)) ** 0.5
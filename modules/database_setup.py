@@ -1,14 +1,33 @@
 import sqlite3
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
 
 DB_FILE = "data/mahwari.db"
 
+# Connection pool sizing (see get_pool_stats() to tune under load)
+POOL_SIZE = int(os.environ.get("MAHWARI_DB_POOL_SIZE", 8))
+POOL_TIMEOUT = 10 # seconds to wait for a free connection
+BUSY_TIMEOUT = 5 # seconds sqlite waits on a locked database
+
 def init_db():
+    """Creates/migrates the database if needed and returns its schema version."""
     if not os.path.exists("data"):
         os.makedirs("data")
     
     conn = sqlite3.connect(DB_FILE)
     c = conn.cursor()
+
+    # Up-to-date database: one read of the stored version, no DDL
+    if get_schema_version(conn) == SCHEMA_VERSION:
+        conn.close()
+        return SCHEMA_VERSION
+
+    # WAL is persistent in the database file, so it only needs setting once;
+    # readers then no longer block on the writer.
+    c.execute("PRAGMA journal_mode=WAL")
     
     # Create Users Table
     c.execute('''
@@ -43,27 +62,257 @@ def init_db():
     conn.close()
     
     # Migration for existing DB
-    migrate_db()
+    return migrate_db()
 
-def migrate_db():
-    conn = get_connection()
-    c = conn.cursor()
-    # Migrations
+# --- Schema Migrations ---
+# Ordered (version, function) pairs. Each one runs once, inside its own
+# transaction, and is recorded in schema_version. Append new migrations at
+# the end; never renumber or edit one that has shipped.
+
+def _add_missing_columns(c):
+    # Columns added before versioning existed; older databases may lack them
     cols = [
         ("users", "hue", "INTEGER DEFAULT 0"),
         ("users", "language", "TEXT DEFAULT 'en'"),
         ("users", "user_id", "TEXT"),
         ("cycles", "duration", "INTEGER DEFAULT 28")
     ]
-    
     for table, col, dtype in cols:
-        try:
+        existing = {row[1] for row in c.execute(f"PRAGMA table_info({table})")}
+        if col not in existing:
             c.execute(f"ALTER TABLE {table} ADD COLUMN {col} {dtype}")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass # Column likely exists
-    
-    conn.close()
+
+def _add_lookup_indexes(c):
+    # get_user_cycles filters on username and orders by start_date; the
+    # composite index also serves plain username lookups.
+    c.execute("CREATE INDEX IF NOT EXISTS idx_cycles_username_start ON cycles (username, start_date)")
+    # Sign-in / PIN recovery look users up by user_id or email as well
+    c.execute("CREATE INDEX IF NOT EXISTS idx_users_user_id ON users (user_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users (email)")
+
+def _add_cycle_stats(c):
+    from .cycle_stats import rebuild_all_stats
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS cycle_stats (
+            username TEXT PRIMARY KEY,
+            cycle_count INTEGER NOT NULL DEFAULT 0,
+            first_start TEXT,
+            last_start TEXT,
+            gap_count INTEGER NOT NULL DEFAULT 0,
+            gap_mean REAL NOT NULL DEFAULT 0,
+            gap_m2 REAL NOT NULL DEFAULT 0,
+            gap_min INTEGER,
+            gap_max INTEGER
+        )
+    ''')
+    rebuild_all_stats(c)
+
+def _add_cycle_end_index(c):
+    # Month-range calendar queries bound on end_date >= first day of month;
+    # history lies in the past, so only recent cycles qualify.
+    c.execute("CREATE INDEX IF NOT EXISTS idx_cycles_username_end ON cycles (username, end_date)")
+
+def _add_user_id_counters(c):
+    from .user_ids import rebuild_counters
+    c.execute("CREATE TABLE IF NOT EXISTS user_id_counters (prefix TEXT PRIMARY KEY, next_value INTEGER NOT NULL)")
+    rebuild_counters(c)
+
+class MigrationConflict(Exception):
+    """Existing rows violate a constraint a migration adds; resolve them by hand."""
+
+def _add_unique_user_constraints(c):
+    # register_user relies on these instead of SELECT-then-INSERT checks.
+    # Email is optional at sign-up and used to be stored as '', which every
+    # such user shares; NULLs don't collide in a UNIQUE index. Any other
+    # shared email / user ID stops the migration (rolled back) with the rows
+    # that need resolving before the app can start.
+    c.execute("UPDATE users SET email = NULL WHERE TRIM(email) = ''")
+    c.execute("UPDATE users SET user_id = NULL WHERE TRIM(user_id) = ''")
+    conflicts = []
+    for column in ("email", "user_id"):
+        for value, usernames in c.execute(
+            f"SELECT {column}, GROUP_CONCAT(username, ', ') FROM users WHERE {column} IS NOT NULL "
+            f"GROUP BY {column} HAVING COUNT(*) > 1"
+        ):
+            conflicts.append(f"  {column} {value!r}: users {usernames}")
+    if conflicts:
+        raise MigrationConflict(
+            "Cannot add unique email / user ID constraints; these users share a value:\n"
+            + "\n".join(conflicts)
+            + f"\nGive each a distinct value (or NULL) in {DB_FILE}, e.g. "
+            "UPDATE users SET email = NULL WHERE username = '...', then restart."
+        )
+    c.execute("DROP INDEX IF EXISTS idx_users_user_id")
+    c.execute("DROP INDEX IF EXISTS idx_users_email")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_users_user_id ON users (user_id)")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_users_email ON users (email)")
+
+def _add_risk_scores(c):
+    # Filled by the batch engine in pcod_batch, not by the request path
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS risk_scores (
+            username TEXT PRIMARY KEY,
+            cycle_count INTEGER NOT NULL,
+            mean_length REAL,
+            std_length REAL,
+            risk_label TEXT NOT NULL,
+            risk_color TEXT NOT NULL,
+            computed_at TEXT NOT NULL
+        )
+    ''')
+
+def _add_settings_version(c):
+    # Global settings version; see modules/settings_cache.py
+    c.execute("CREATE TABLE IF NOT EXISTS settings_version (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)")
+    c.execute("INSERT OR IGNORE INTO settings_version (id, version) VALUES (1, 0)")
+
+def _add_water_intake(c):
+    # One row per user per day, written by modules/water_log.py
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS water_intake (
+            username TEXT NOT NULL,
+            day TEXT NOT NULL,
+            glasses INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (username, day)
+        )
+    ''')
+
+def _add_user_settings_version(c):
+    # Version of each user's last settings write, so settings_cache can drop
+    # only the users written since it last synced
+    existing = {row[1] for row in c.execute("PRAGMA table_info(users)")}
+    if "settings_version" not in existing:
+        c.execute("ALTER TABLE users ADD COLUMN settings_version INTEGER NOT NULL DEFAULT 0")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_users_settings_version ON users (settings_version)")
+
+MIGRATIONS = [
+    (1, _add_missing_columns),
+    (2, _add_lookup_indexes),
+    (3, _add_cycle_stats),
+    (4, _add_cycle_end_index),
+    (5, _add_user_id_counters),
+    (6, _add_unique_user_constraints),
+    (7, _add_risk_scores),
+    (8, _add_settings_version),
+    (9, _add_water_intake),
+    (10, _add_user_settings_version),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn):
+    try:
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0 # No schema_version table yet
+
+def migrate_db():
+    conn = get_connection()
+    conn.isolation_level = None # explicit BEGIN/COMMIT so DDL is transactional too
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, applied_at TEXT)")
+        for version, migration in MIGRATIONS:
+            if version <= get_schema_version(conn):
+                continue
+            # IMMEDIATE takes the write lock up front, so a second process
+            # migrating at the same time waits and then sees the new version.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if version > get_schema_version(conn):
+                    migration(conn)
+                    conn.execute("INSERT INTO schema_version (version, applied_at) VALUES (?, datetime('now'))", (version,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return get_schema_version(conn)
+    finally:
+        conn.close()
 
 def get_connection():
     return sqlite3.connect(DB_FILE)
+
+# --- Connection Pool ---
+# Streamlit runs every session (and rerun) on its own script thread, so the
+# pool hands out idle connections to whichever thread asks; a connection is
+# only ever used by one thread at a time.
+_pool = queue.LifoQueue()
+_pool_lock = threading.Lock()
+_pool_open = 0
+_pool_stats = {"hits": 0, "misses": 0, "waits": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "timeouts": 0, "transactions": 0, "busy_ms_total": 0.0}
+
+def _open_pooled_connection():
+    conn = sqlite3.connect(DB_FILE, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def _acquire():
+    global _pool_open
+    try:
+        conn = _pool.get_nowait()
+        with _pool_lock:
+            _pool_stats["hits"] += 1
+        return conn
+    except queue.Empty:
+        pass
+
+    with _pool_lock:
+        can_open = _pool_open < POOL_SIZE
+        if can_open:
+            _pool_open += 1
+            _pool_stats["misses"] += 1
+    if can_open:
+        try:
+            return _open_pooled_connection()
+        except Exception:
+            with _pool_lock:
+                _pool_open -= 1
+            raise
+
+    # Pool exhausted: wait for another thread to hand one back
+    start = time.perf_counter()
+    try:
+        conn = _pool.get(timeout=POOL_TIMEOUT)
+    except queue.Empty:
+        with _pool_lock:
+            _pool_stats["timeouts"] += 1
+        raise sqlite3.OperationalError("Timed out waiting for a database connection")
+    waited = (time.perf_counter() - start) * 1000
+    with _pool_lock:
+        _pool_stats["waits"] += 1
+        _pool_stats["wait_ms_total"] += waited
+        _pool_stats["wait_ms_max"] = max(_pool_stats["wait_ms_max"], waited)
+    return conn
+
+@contextmanager
+def transaction():
+    """
+    Borrow a pooled connection for one unit of work.
+    Commits when the block exits normally, rolls back if it raises.
+    """
+    conn = _acquire()
+    start = time.perf_counter()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _pool.put(conn)
+        # Time the connection was checked out: the app's DB time
+        busy = (time.perf_counter() - start) * 1000
+        with _pool_lock:
+            _pool_stats["transactions"] += 1
+            _pool_stats["busy_ms_total"] += busy
+
+def get_pool_stats():
+    with _pool_lock:
+        stats = dict(_pool_stats)
+        stats["open"] = _pool_open
+    stats["idle"] = _pool.qsize()
+    stats["size"] = POOL_SIZE
+    lookups = stats["hits"] + stats["misses"] + stats["waits"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
@@ -0,0 +1,89 @@
+"""
+PBKDF2 cost policy for PIN hashes.
+
+The rounds are calibrated on the deployment host so one hash takes about
+TARGET_MS, then stored in HASH_POLICY_FILE. Stored hashes whose rounds fall
+outside the policy band are rehashed transparently on the next sign-in.
+
+    python -m modules.hash_policy --target-ms 100
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+HASH_POLICY_FILE = "data/hash_policy.json"
+SCHEME = "pbkdf2_sha256"
+TARGET_MS = 100
+# Hashes within +/- this fraction of the policy rounds are left alone
+TOLERANCE = 0.25
+MIN_ROUNDS = 10_000
+
+def load_policy(path=HASH_POLICY_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def build_context(policy=None):
+    from passlib.context import CryptContext
+    if policy is None:
+        policy = load_policy()
+    if not policy:
+        # Uncalibrated: library defaults, nothing flagged for rehash
+        return CryptContext(schemes=[SCHEME], deprecated="auto")
+    rounds = policy["rounds"]
+    return CryptContext(
+        schemes=[SCHEME],
+        deprecated="auto",
+        **{
+            f"{SCHEME}__default_rounds": rounds,
+            f"{SCHEME}__min_rounds": max(MIN_ROUNDS, int(rounds * (1 - TOLERANCE))),
+            f"{SCHEME}__max_rounds": int(rounds * (1 + TOLERANCE)),
+        }
+    )
+
+def _time_hash(rounds, samples=5):
+    from passlib.context import CryptContext
+    ctx = CryptContext(schemes=[SCHEME], **{f"{SCHEME}__default_rounds": rounds})
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        ctx.hash("000000")
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+def calibrate(target_ms=TARGET_MS):
+    # PBKDF2 cost is linear in rounds: measure once, scale, then confirm
+    probe = 50_000
+    rounds = max(MIN_ROUNDS, int(probe * target_ms / _time_hash(probe)))
+    measured = _time_hash(rounds)
+    return {
+        "scheme": SCHEME,
+        "rounds": rounds,
+        "target_ms": target_ms,
+        "measured_ms": round(measured, 1),
+        "calibrated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+def save_policy(policy, path=HASH_POLICY_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(policy, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate PBKDF2 rounds for PIN hashing on this host.")
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS, help="desired time per hash")
+    parser.add_argument("--dry-run", action="store_true", help="print the policy without saving it")
+    args = parser.parse_args()
+
+    policy = calibrate(args.target_ms)
+    print(json.dumps(policy, indent=2))
+    if not args.dry_run:
+        save_policy(policy)
+        print(f"saved to {HASH_POLICY_FILE}; restart the app to apply")
+
+if __name__ == "__main__":
+    main()
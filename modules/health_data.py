@@ -1,22 +1,70 @@
 import streamlit as st
-import pandas as pd
-import base64
+from datetime import date
+from .assets import image_tag
+from .water_log import record_glasses, get_glasses
+from .metrics import timed
 
-def get_base64_image(image_path):
-    try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except FileNotFoundError:
-        return ""
+# Data from sample project
+EXERCISE_SECTIONS = [
+    {
+        "title": "1. Cardio Exercises",
+        "desc": "Increases heart rate and burns fat.",
+        "items": [
+            { "name": "Brisk Walking", "note": "30-45 mins daily improves insulin sensitivity.", "img": "assets/walking.png" },
+            { "name": "Cycling", "note": "Strengthens abs and reduces weight.", "img": "assets/cycling.png" },
+            { "name": "Swimming", "note": "Great for hormone balance.", "img": "assets/swimming.png" }
+        ]
+    },
+    {
+        "title": "2. Yoga Asanas",
+        "desc": "Reduces stress and balances hormones.",
+        "items": [
+            { "name": "Butterfly Pose", "note": "Increases blood flow to ovaries.", "img": "assets/butterfly.png" },
+            { "name": "Cobra Pose", "note": "Stretches abdomen, fixes period issues.", "img": "assets/cobra.png" },
+            { "name": "Bow Pose", "note": "Stimulates reproductive organs.", "img": "assets/bow.png" },
+            { "name": "Surya Namaskar", "note": "Revitalizes entire body. 10-12 sets.", "img": "assets/surya.png" }
+        ]
+    },
+    {
+        "title": "3. Strength Training",
+        "desc": "Muscle building regulates blood sugar.",
+        "items": [
+            { "name": "Squats", "note": "Strengthens legs and hips.", "img": "assets/squat.png" },
+            { "name": "Plank", "note": "Strengthens core muscles.", "img": "assets/plank.png" },
+            { "name": "Light Weights", "note": "2-3 times a week.", "img": "assets/weights.png" }
+        ]
+    }
+]
 
-def render_water_tracker(t=None):
+# Rendered size of .exercise-img (see assets/style.css)
+EXERCISE_IMG_WIDTH = 60
+
+WATER_GOAL = 8
+
+def _set_glasses(username, glasses):
+    st.session_state["water_count"] = glasses
+    if username:
+        record_glasses(username, st.session_state["water_day"], glasses)
+
+def _add_glass(username):
+    # Read the count at click time, so queued clicks are not lost
+    _set_glasses(username, st.session_state["water_count"] + 1)
+
+@st.fragment
+@timed()
+def render_water_tracker(t=None, username=None):
+    # A fragment: clicks rerun only this block, not the whole dashboard.
+    # Counts are loaded once per session and day, then kept in session state;
+    # writes go through the water_log write-behind buffer.
     if t is None: t = {"water_tracker": "💧 Water Intake Tracker", "glasses": "Glasses", "add": "➕ Add", "reset": "🔄 Reset"}
-    st.markdown(f"### {t.get('water_tracker', '💧 Water Intake Tracker')}")
+    st.markdown(f"### {t['water_tracker']}")
     
-    if "water_count" not in st.session_state:
-        st.session_state["water_count"] = 0
+    today = date.today()
+    if st.session_state.get("water_day") != today:
+        st.session_state["water_day"] = today
+        st.session_state["water_count"] = get_glasses(username, today) if username else 0
         
-    goal = 8
+    goal = WATER_GOAL
     progress = min(st.session_state["water_count"] / goal, 1.0)
     
     # Custom Glass Progress Bar
@@ -25,64 +73,29 @@ def render_water_tracker(t=None):
         <div style="width: {progress*100}%; background: linear-gradient(90deg, #00c6ff, #0072ff); height: 20px; border-radius: 8px; transition: width 0.5s;"></div>
     </div>
     <div style="text-align: center; margin-bottom: 20px; color: #00c6ff; font-weight: bold; font-size: 1.2em;">
-        {st.session_state["water_count"]} / {goal} {t.get('glasses', 'Glasses')}
+        {st.session_state["water_count"]} / {goal} {t['glasses']}
     </div>
     """, unsafe_allow_html=True)
     
+    # Callbacks update the count before the fragment re-renders
     col1, col2 = st.columns(2)
     with col1:
-        if st.button(t.get('add', '➕ Add'), use_container_width=True):
-            st.session_state["water_count"] += 1
-            st.rerun()
+        st.button(t['add'], use_container_width=True, on_click=_add_glass, args=(username,))
     with col2:
-        if st.button(t.get('reset', '🔄 Reset'), use_container_width=True):
-            st.session_state["water_count"] = 0
-            st.rerun()
+        st.button(t['reset'], use_container_width=True, on_click=_set_glasses, args=(username, 0))
 
+@timed()
 def render_exercise_guide(t=None):
     if t is None: t = {"exercise_guide": "Exercise Guide", "note": "Note", "consistency_msg": "Consistency is key. 5 days a week."}
-    st.markdown(f"<h2 style='color: var(--primary-color);'>{t.get('exercise_guide', 'Exercise Guide')}</h2>", unsafe_allow_html=True)
-    st.markdown(f"<div class='glass-card' style='padding: 10px; margin-bottom: 20px;'><strong>{t.get('note', 'Note')}:</strong> {t.get('consistency_msg', 'Consistency is key.')}</div>", unsafe_allow_html=True)
-    
-    # Data from sample project
-    sections = [
-        {
-            "title": "1. Cardio Exercises",
-            "desc": "Increases heart rate and burns fat.",
-            "items": [
-                { "name": "Brisk Walking", "note": "30-45 mins daily improves insulin sensitivity.", "img": "assets/walking.png" },
-                { "name": "Cycling", "note": "Strengthens abs and reduces weight.", "img": "assets/cycling.png" },
-                { "name": "Swimming", "note": "Great for hormone balance.", "img": "assets/swimming.png" }
-            ]
-        },
-        {
-            "title": "2. Yoga Asanas",
-            "desc": "Reduces stress and balances hormones.",
-            "items": [
-                { "name": "Butterfly Pose", "note": "Increases blood flow to ovaries.", "img": "assets/butterfly.png" },
-                { "name": "Cobra Pose", "note": "Stretches abdomen, fixes period issues.", "img": "assets/cobra.png" },
-                { "name": "Bow Pose", "note": "Stimulates reproductive organs.", "img": "assets/bow.png" },
-                { "name": "Surya Namaskar", "note": "Revitalizes entire body. 10-12 sets.", "img": "assets/surya.png" }
-            ]
-        },
-        {
-            "title": "3. Strength Training",
-            "desc": "Muscle building regulates blood sugar.",
-            "items": [
-                { "name": "Squats", "note": "Strengthens legs and hips.", "img": "assets/squat.png" },
-                { "name": "Plank", "note": "Strengthens core muscles.", "img": "assets/plank.png" },
-                { "name": "Light Weights", "note": "2-3 times a week.", "img": "assets/weights.png" }
-            ]
-        }
-    ]
+    st.markdown(f"<h2 style='color: var(--primary-color);'>{t['exercise_guide']}</h2>", unsafe_allow_html=True)
+    st.markdown(f"<div class='glass-card' style='padding: 10px; margin-bottom: 20px;'><strong>{t['note']}:</strong> {t['consistency_msg']}</div>", unsafe_allow_html=True)
     
-    for section in sections:
+    for section in EXERCISE_SECTIONS:
         st.markdown(f"### {section['title']}")
         st.caption(section['desc'])
         
         for item in section['items']:
-            b64_img = get_base64_image(item['img'])
-            img_tag = f'<img src="data:image/png;base64,{b64_img}" class="exercise-img">' if b64_img else ''
+            img_tag = image_tag(item['img'], EXERCISE_IMG_WIDTH, css_class="exercise-img")
             
             st.markdown(f"""
             <div class="exercise-card">
@@ -0,0 +1,148 @@
+"""
+Opt-in timing for the rerun hot path.
+
+Set MAHWARI_METRICS=1 to collect per-section timings (p50/p95/p99 over the
+last SAMPLES calls). With it unset, timed() returns the function untouched
+and section() hands back a shared no-op context manager.
+
+Readouts: snapshot() as a dict, to_prometheus() as Prometheus text, an HTTP
+endpoint on MAHWARI_METRICS_PORT (/metrics, /metrics.json) and the app's
+debug panel (?debug=1).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get("MAHWARI_METRICS") == "1"
+METRICS_PORT = int(os.environ.get("MAHWARI_METRICS_PORT", 0))
+METRICS_HOST = os.environ.get("MAHWARI_METRICS_HOST", "127.0.0.1")
+SAMPLES = 1000
+PREFIX = "mahwari"
+
+_lock = threading.Lock()
+_sections = {} # name -> {"count", "total_ms", "samples": deque}
+_noop = nullcontext()
+_server = None
+
+def percentiles(samples):
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+def record(name, ms):
+    with _lock:
+        entry = _sections.get(name)
+        if entry is None:
+            entry = _sections[name] = {"count": 0, "total_ms": 0.0, "samples": deque(maxlen=SAMPLES)}
+        entry["count"] += 1
+        entry["total_ms"] += ms
+        entry["samples"].append(ms)
+
+@contextmanager
+def _timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000)
+
+def section(name):
+    """with section("name"): ... times the block when metrics are enabled."""
+    return _timer(name) if ENABLED else _noop
+
+def timed(name=None):
+    """Decorator form of section(); a no-op (returns fn itself) when disabled."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+def get_section_stats():
+    with _lock:
+        copied = {name: (e["count"], e["total_ms"], list(e["samples"])) for name, e in _sections.items()}
+    return {
+        name: {"count": count, "total_ms": total, **percentiles(samples)}
+        for name, (count, total, samples) in sorted(copied.items())
+    }
+
+def snapshot():
+    # Imported here: metrics is imported by the modules it reports on
+    from .database_setup import get_pool_stats
+    from .pin_hasher import get_hash_stats
+    from .throttle import get_throttle_stats
+    from .settings_cache import get_settings_cache_stats
+    from .water_log import get_water_log_stats
+    return {
+        "enabled": ENABLED,
+        "sections": get_section_stats(),
+        "pool": get_pool_stats(),
+        "hasher": get_hash_stats(),
+        "throttle": get_throttle_stats(),
+        "settings_cache": get_settings_cache_stats(),
+        "water_log": get_water_log_stats(),
+    }
+
+def to_prometheus(snap=None):
+    snap = snap or snapshot()
+    lines = [f"# TYPE {PREFIX}_section_ms summary"]
+    for name, s in snap["sections"].items():
+        for q in ("p50", "p95", "p99"):
+            lines.append(f'{PREFIX}_section_ms{{section="{name}",quantile="0.{q[1:]}"}} {s[q]:.3f}')
+        lines.append(f'{PREFIX}_section_ms_sum{{section="{name}"}} {s["total_ms"]:.3f}')
+        lines.append(f'{PREFIX}_section_ms_count{{section="{name}"}} {s["count"]}')
+    for group in ("pool", "hasher", "throttle", "settings_cache", "water_log"):
+        for key, value in snap[group].items():
+            if isinstance(value, dict):
+                # Percentile dicts (hasher hash_ms / wait_ms)
+                for q, v in value.items():
+                    lines.append(f'{PREFIX}_{group}_{key}{{quantile="0.{q[1:]}"}} {v:.3f}')
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"{PREFIX}_{group}_{key} {value}")
+    return "\n".join(lines) + "\n"
+
+def _respond(handler):
+    if handler.path == "/metrics":
+        body, ctype = to_prometheus().encode(), "text/plain; version=0.0.4"
+    elif handler.path == "/metrics.json":
+        body, ctype = json.dumps(snapshot()).encode(), "application/json"
+    else:
+        handler.send_error(404)
+        return
+    handler.send_response(200)
+    handler.send_header("Content-Type", ctype)
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+def start_server(port=METRICS_PORT, host=METRICS_HOST):
+    """Serves /metrics and /metrics.json on port in a daemon thread (once per process)."""
+    global _server
+    # http.server is only needed when the endpoint is on
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        do_GET = _respond
+        def log_message(self, *args):
+            pass
+
+    with _lock:
+        if _server is not None or not port:
+            return _server
+        _server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
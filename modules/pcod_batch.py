@@ -0,0 +1,141 @@
+"""
+Population-wide PCOD risk scoring.
+
+Loads every user's cycle start dates in one query, computes per-user
+cycle-length mean / std with NumPy segment reductions over the
+(username, start_date)-sorted array, applies the same tiers as
+pcod_logic.calculate_pcod_risk, and writes the results to risk_scores.
+Large databases can be sharded by username range across a process pool.
+
+    python -m modules.pcod_batch [--workers 4]
+"""
+import argparse
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from . import database_setup
+from .database_setup import transaction
+
+MIN_CYCLES = 3
+# Same labels / colours as pcod_logic._risk_tier, indexed by score tier
+TIERS = [("Low Risk", "#00ff00"), ("Medium Risk", "#ffa500"), ("High Risk", "#ff4b4b")]
+INSUFFICIENT = ("Insufficient Data (Need 3+ cycles)", "gray")
+
+def _load(db_file, lo=None, hi=None):
+    where, params = "", ()
+    if lo is not None:
+        where, params = "WHERE username >= ? AND username < ?", (lo, hi)
+    conn = sqlite3.connect(db_file)
+    try:
+        # Day numbers come straight from SQLite; no per-row date parsing in Python
+        rows = conn.execute(
+            f"SELECT username, CAST(julianday(start_date) AS INTEGER) FROM cycles {where} ORDER BY username, start_date",
+            params
+        ).fetchall()
+    finally:
+        conn.close()
+    users = np.array([row[0] for row in rows], dtype=object)
+    starts = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    return users, starts
+
+def score_segments(users, starts):
+    """
+    users / starts sorted by (user, start). Returns (usernames, cycle_count,
+    mean_length, std_length, tier) with tier -1 meaning insufficient data.
+    """
+    if not len(users):
+        empty = np.array([])
+        return np.array([], dtype=object), empty.astype(np.int64), empty, empty, empty.astype(np.int64)
+
+    # Segment boundaries: where the username changes
+    boundary = np.ones(len(users), dtype=bool)
+    boundary[1:] = users[1:] != users[:-1]
+    codes = np.cumsum(boundary) - 1
+    names = users[boundary]
+    n_users = len(names)
+    counts = np.bincount(codes, minlength=n_users)
+
+    # Cycle lengths: start-to-start gaps within the same user
+    same = ~boundary[1:]
+    gaps = np.diff(starts)[same].astype(np.float64)
+    gap_codes = codes[1:][same]
+    n = np.bincount(gap_codes, minlength=n_users).astype(np.float64)
+    total = np.bincount(gap_codes, weights=gaps, minlength=n_users)
+    total_sq = np.bincount(gap_codes, weights=gaps * gaps, minlength=n_users)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / n
+        # Sample variance (ddof=1) to match pandas .std()
+        var = np.clip((total_sq - total * mean) / (n - 1), 0, None)
+        std = np.sqrt(var)
+
+    score = np.where((mean > 35) | (mean < 21), 2, 0) + np.where(std > 5, 1, 0)
+    tier = np.minimum(score, 2)
+    tier[counts < MIN_CYCLES] = -1
+    return names, counts, mean, std, tier
+
+def _score_shard(args):
+    db_file, lo, hi = args
+    return score_segments(*_load(db_file, lo, hi))
+
+def _shard_bounds(db_file, shards):
+    # Split the distinct usernames into contiguous ranges of similar size
+    conn = sqlite3.connect(db_file)
+    try:
+        users = [row[0] for row in conn.execute("SELECT DISTINCT username FROM cycles ORDER BY username")]
+    finally:
+        conn.close()
+    if not users:
+        return []
+    step = -(-len(users) // shards)
+    starts = users[::step]
+    # Upper bound past every real username for the last shard
+    return list(zip(starts, starts[1:] + [users[-1] + "\U0010ffff"]))
+
+def compute_risk_scores(workers=1, db_file=None):
+    db_file = db_file or database_setup.DB_FILE
+    if workers <= 1:
+        results = [score_segments(*_load(db_file))]
+    else:
+        bounds = _shard_bounds(db_file, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_shard, [(db_file, lo, hi) for lo, hi in bounds]))
+    return results
+
+def save_risk_scores(results):
+    computed_at = datetime.now().isoformat(timespec="seconds")
+    def rows():
+        for names, counts, mean, std, tier in results:
+            for i in range(len(names)):
+                label, color = TIERS[tier[i]] if tier[i] >= 0 else INSUFFICIENT
+                yield (
+                    names[i], int(counts[i]),
+                    None if np.isnan(mean[i]) else float(mean[i]),
+                    None if np.isnan(std[i]) else float(std[i]),
+                    label, color, computed_at,
+                )
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO risk_scores (username, cycle_count, mean_length, std_length, risk_label, risk_color, computed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows()
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute PCOD risk scores for every user.")
+    parser.add_argument("--workers", type=int, default=1, help="processes to shard users across")
+    args = parser.parse_args()
+
+    database_setup.init_db()
+    start = time.perf_counter()
+    results = compute_risk_scores(args.workers)
+    save_risk_scores(results)
+    users = sum(len(r[0]) for r in results)
+    print(f"scored {users:,} users in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
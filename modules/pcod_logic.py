@@ -1,5 +1,4 @@
-import pandas as pd
-import numpy as np
+from .cycle_stats import gap_std
 
 def calculate_pcod_risk(cycles_df):
     """
@@ -12,6 +11,7 @@ def calculate_pcod_risk(cycles_df):
     if cycles_df.empty or len(cycles_df) < 3:
         return "Insufficient Data (Need 3+ cycles)", "gray"
     
+    import pandas as pd
     cycles_df['start_date'] = pd.to_datetime(cycles_df['start_date'])
     cycles_df = cycles_df.sort_values('start_date')
     
@@ -24,7 +24,18 @@ def calculate_pcod_risk(cycles_df):
         
     avg_length = cycle_lengths.mean()
     std_dev = cycle_lengths.std()
-    
+    return _risk_tier(avg_length, std_dev)
+
+def calculate_pcod_risk_from_stats(stats):
+    """
+    Same assessment as calculate_pcod_risk, read straight from the running
+    aggregates in cycle_stats instead of the full cycle history.
+    """
+    if not stats or stats["cycle_count"] < 3:
+        return "Insufficient Data (Need 3+ cycles)", "gray"
+    return _risk_tier(stats["gap_mean"], gap_std(stats))
+
+def _risk_tier(avg_length, std_dev):
     risk_score = 0
     reasons = []
     
@@ -37,7 +48,7 @@ def calculate_pcod_risk(cycles_df):
         reasons.append("Average cycle length < 21 days")
         
     # Check for irregularity
-    if std_dev > 5: # High variance
+    if std_dev is not None and std_dev > 5: # High variance
         risk_score += 1
         reasons.append("Irregular cycle lengths")
     
@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from .metrics import percentiles
+
+# PIN hashing (pbkdf2) is CPU-bound and runs on a dedicated, size-limited
+# pool so a burst of sign-ins can't starve every other session's reruns.
+# hashlib releases the GIL while deriving keys, so threads run in parallel.
+HASH_WORKERS = int(os.environ.get("MAHWARI_HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+# Jobs allowed to be running or queued at once; beyond that callers are
+# turned away immediately instead of piling up behind the pool.
+HASH_QUEUE_LIMIT = int(os.environ.get("MAHWARI_HASH_QUEUE_LIMIT", HASH_WORKERS * 8))
+HASH_TIMEOUT = 10 # seconds a caller waits for its result
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full or a hash misses HASH_TIMEOUT."""
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="pin-hash")
+_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+_stats_lock = threading.Lock()
+_stats = {"submitted": 0, "completed": 0, "rejected": 0, "timed_out": 0, "in_flight": 0}
+# Recent samples (ms) for percentile reporting
+_hash_ms = deque(maxlen=1000)
+_wait_ms = deque(maxlen=1000)
+
+def _timed(fn, args, queued_at):
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        done = time.perf_counter()
+        with _stats_lock:
+            _wait_ms.append((started - queued_at) * 1000)
+            _hash_ms.append((done - started) * 1000)
+            _stats["completed"] += 1
+            _stats["in_flight"] -= 1
+        _slots.release()
+
+def run(fn, *args):
+    """Runs fn(*args) on the hashing pool and returns its result."""
+    if not _slots.acquire(blocking=False):
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise HasherBusy("PIN verification is busy")
+    with _stats_lock:
+        _stats["submitted"] += 1
+        _stats["in_flight"] += 1
+    try:
+        future = _executor.submit(_timed, fn, args, time.perf_counter())
+    except Exception:
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+        _slots.release()
+        raise
+    try:
+        return future.result(timeout=HASH_TIMEOUT)
+    except FutureTimeout:
+        # The job keeps its slot until it finishes; only the caller gives up
+        with _stats_lock:
+            _stats["timed_out"] += 1
+        raise HasherBusy("PIN verification timed out") from None
+
+def get_hash_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+        hash_ms, wait_ms = list(_hash_ms), list(_wait_ms)
+    stats["workers"] = HASH_WORKERS
+    stats["queue_limit"] = HASH_QUEUE_LIMIT
+    stats["hash_ms"] = percentiles(hash_ms)
+    stats["wait_ms"] = percentiles(wait_ms)
+    return stats
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import database_setup
+
+# Per-process cache of user settings (hue, language), shared by every
+# session so a rerun does not have to query the users table.
+#  * Every settings write takes the next global version in SQLite, stamps it
+#    on the user's row (users.settings_version) and, after commit, mirrors
+#    it to a small file next to the database.
+#  * The file only says "some user's settings changed". When it moves past
+#    the version this process last synced to, one indexed query finds the
+#    users written since then and only their entries are dropped.
+#  * SETTINGS_TTL bounds staleness if the file is ever missed.
+
+VERSION_FILE_NAME = "settings_version"
+SETTINGS_TTL = 300 # seconds
+MAX_ENTRIES = 10_000
+
+_lock = threading.Lock()
+_entries = OrderedDict() # username -> (settings, loaded_at)
+_counters = {"hits": 0, "misses": 0, "writes": 0, "syncs": 0, "dropped": 0}
+_seen = (None, 0) # (version file signature, version)
+_synced = 0 # entries reflect every write up to this version
+
+def _version_file():
+    return os.path.join(os.path.dirname(database_setup.DB_FILE) or ".", VERSION_FILE_NAME)
+
+def current_version():
+    # A stat per call; the file is only re-read when it has been replaced
+    global _seen
+    path = _version_file()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0
+    signature = (path, st.st_ino, st.st_mtime_ns, st.st_size)
+    if signature != _seen[0]:
+        try:
+            with open(path) as f:
+                _seen = (signature, int(f.read()))
+        except (OSError, ValueError):
+            return 0
+    return _seen[1]
+
+def publish_version(version):
+    # Write-then-rename so readers never see a partial value. Publishes can
+    # land out of order; readers only compare for equality, and every
+    # committed write has its own version, so that is still safe.
+    path = _version_file()
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp, "w") as f:
+        f.write(str(version))
+    os.replace(tmp, path)
+
+def _sync(version):
+    # Caller holds _lock. Every write up to version has committed (the file
+    # is published after commit), so this sees all of them.
+    global _synced
+    if _entries:
+        with database_setup.transaction() as conn:
+            changed = conn.execute("SELECT username FROM users WHERE settings_version > ?", (_synced,)).fetchall()
+        for (username,) in changed:
+            if _entries.pop(username, None) is not None:
+                _counters["dropped"] += 1
+    _counters["syncs"] += 1
+    _synced = version
+
+def get(username, load):
+    """Cached settings for username, calling load(username) on a miss. None results are not cached."""
+    version = current_version()
+    now = time.monotonic()
+    with _lock:
+        if version != _synced:
+            _sync(version)
+        entry = _entries.get(username)
+        if entry and now - entry[1] < SETTINGS_TTL:
+            _entries.move_to_end(username)
+            _counters["hits"] += 1
+            return dict(entry[0])
+        _counters["misses"] += 1
+
+    settings = load(username)
+    if settings is not None:
+        _store(username, settings, version, now)
+    return settings
+
+def invalidate(username, version):
+    """
+    Record a committed settings write: publish its version and drop this
+    process's entry. The next get reloads it rather than trusting the value
+    written, which a concurrent write from another worker could already
+    have replaced.
+    """
+    publish_version(version)
+    with _lock:
+        _counters["writes"] += 1
+        _entries.pop(username, None)
+
+def _store(username, settings, version, loaded_at):
+    with _lock:
+        # A sync since the load may have dropped this user for a write the
+        # load missed; only cache if none ran
+        if version != _synced:
+            return
+        _entries[username] = (dict(settings), loaded_at)
+        _entries.move_to_end(username)
+        if len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+def get_settings_cache_stats():
+    with _lock:
+        stats = dict(_counters, entries=len(_entries))
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["version"] = current_version()
+    stats["synced"] = _synced
+    return stats
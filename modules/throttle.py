@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Pre-auth throttling for sign-in and PIN recovery. Attempts are shed here,
+# before they reach SQLite or the PIN hasher:
+#  * token buckets per identifier (username / user ID / email) and per client;
+#    a successful sign-in gives its client token back, so only failed and
+#    unknown attempts add up for a client (many users may share one IP
+#    behind a proxy or NAT)
+#  * a bounded LRU of identifiers recently found not to exist
+
+# (tokens refilled per second, bucket capacity)
+IDENTIFIER_RATE = (5 / 60, 5) # 5 attempts per minute per account
+CLIENT_RATE = (20 / 60, 10) # 20 attempts per minute per client, bursts of 10
+MAX_BUCKETS = 10_000
+MAX_UNKNOWN = 10_000
+UNKNOWN_TTL = 300 # seconds an unknown identifier stays cached
+
+class Throttled(Exception):
+    """Raised when an identifier or client has run out of attempts."""
+
+_lock = threading.Lock()
+_buckets = OrderedDict() # (kind, key) -> [tokens, last_refill]
+_unknown = OrderedDict() # identifier -> expiry time
+_counters = {"allowed": 0, "throttled_identifier": 0, "throttled_client": 0, "unknown_hits": 0, "unknown_added": 0, "client_refunds": 0}
+
+def _take(kind, key, rate):
+    refill, capacity = rate
+    now = time.monotonic()
+    bucket = _buckets.get((kind, key))
+    if bucket is None:
+        bucket = _buckets[(kind, key)] = [capacity, now]
+        if len(_buckets) > MAX_BUCKETS:
+            _buckets.popitem(last=False)
+    else:
+        _buckets.move_to_end((kind, key))
+        bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill)
+        bucket[1] = now
+    if bucket[0] < 1:
+        return False
+    bucket[0] -= 1
+    return True
+
+def check(identifier, client=None):
+    """Spends one attempt for identifier and client; raises Throttled if either is exhausted."""
+    identifier = (identifier or "").strip().lower()
+    with _lock:
+        if client is not None and not _take("client", client, CLIENT_RATE):
+            _counters["throttled_client"] += 1
+            raise Throttled("Too many attempts from this device")
+        if not _take("identifier", identifier, IDENTIFIER_RATE):
+            _counters["throttled_identifier"] += 1
+            raise Throttled("Too many attempts for this account")
+        _counters["allowed"] += 1
+
+def succeeded(client):
+    """Refunds the attempt check() took from client, after a successful sign-in."""
+    if client is None:
+        return
+    with _lock:
+        bucket = _buckets.get(("client", client))
+        if bucket is not None:
+            bucket[0] = min(CLIENT_RATE[1], bucket[0] + 1)
+            _counters["client_refunds"] += 1
+
+# Lookups are exact-match, so the unknown cache keys on the identifier as typed
+def is_known_unknown(identifier):
+    with _lock:
+        expiry = _unknown.get(identifier)
+        if expiry is None:
+            return False
+        if expiry < time.monotonic():
+            del _unknown[identifier]
+            return False
+        _counters["unknown_hits"] += 1
+        return True
+
+def remember_unknown(identifier):
+    with _lock:
+        _unknown[identifier] = time.monotonic() + UNKNOWN_TTL
+        _unknown.move_to_end(identifier)
+        _counters["unknown_added"] += 1
+        if len(_unknown) > MAX_UNKNOWN:
+            _unknown.popitem(last=False)
+
+def forget_unknown(*identifiers):
+    # Called on sign-up so a freshly registered name is found right away
+    with _lock:
+        for identifier in identifiers:
+            _unknown.pop(identifier, None)
+
+def get_throttle_stats():
+    with _lock:
+        stats = dict(_counters)
+        stats["buckets"] = len(_buckets)
+        stats["unknown_cached"] = len(_unknown)
+    # Attempts that never reached the database / hasher
+    stats["work_avoided"] = stats["throttled_identifier"] + stats["throttled_client"] + stats["unknown_hits"]
+    return stats
@@ -1,422 +1,49 @@
-translations = {
-    "en": {
-        "app_name": "Mahwari ka Trekr",
-        "welcome": "Welcome",
-        "logout": "Logout",
-        "tab_tracker": "📅 Tracker",
-        "tab_analytics": "📊 Analytics",
-        "tab_health": "🧘‍♀️ Health",
-        "tab_settings": "⚙️ Settings",
-        "log_period": "Log Period",
-        "start_date": "Start Date",
-        "end_date": "End Date",
-        "save_cycle": "Save Cycle",
-        "cycle_saved_msg": "Cycle logged!",
-        "date_error": "End date cannot be before start date.",
-        "predicted_next": "Predicted Next Period",
-        "cycle_analysis": "Cycle Analysis",
-        "pcod_risk": "PCOD Risk Assessment",
-        "risk_low": "Low Risk",
-        "risk_medium": "Medium Risk",
-        "risk_high": "High Risk",
-        "risk_desc": "Based on cycle regularity and duration.",
-        "view_table": "View Data Table",
-        "settings": "Settings",
-        "language": "Language",
-        "theme_color": "Theme Color",
-        "adjust_theme": "Adjust Theme Color",
-        "change_pin": "Change PIN",
-        "security_pin": "Security PIN",
-        "pin_info": "Logout -> Forgot PIN to reset.",
-        "water_tracker": "💧 Water Intake Tracker",
-        "exercise_guide": "Exercise Guide",
-        "add": "➕ Add",
-        "reset": "🔄 Reset",
-        "glasses": "Glasses",
-        "note": "Note",
-        "consistency_msg": "Consistency is key. 5 days a week."
-    },
-
-     "ta": {
-        "app_name": "மாதவிடாய் ட்ராக்கர்",
-        "welcome": "வரவேற்கிறோம்",
-        "logout": "வெளியேறு",
-        "tab_tracker": "📅 ட்ராக்கர்",
-        "tab_analytics": "📊 பகுப்பாய்வு",
-        "tab_health": "🧘‍♀️ ஆரோக்கியம்",
-        "tab_settings": "⚙️ அமைப்புகள்",
-        "log_period": "மாதவிடாயைப் பதிவுசெய்க",
-        "start_date": "தொடக்க தேதி",
-        "end_date": "முடிவு தேதி",
-        "save_cycle": "சேமிக்க",
-        "cycle_saved_msg": "சுழற்சி பதிவு செய்யப்பட்டது!",
-        "date_error": "முடிவு தேதி தொடக்க தேதிக்கு முன் இருக்கக்கூடாது.",
-        "predicted_next": "அடுத்த கணிக்கப்பட்ட தேதி",
-        "cycle_analysis": "சுழற்சி பகுப்பாய்வு",
-        "pcod_risk": "PCOD ஆபத்து மதிப்பீடு",
-        "risk_low": "குறைந்த ஆபத்து",
-        "risk_medium": "நடுத்தர ஆபத்து",
-        "risk_high": "அதிக ஆபத்து",
-        "risk_desc": "சுழற்சி முறை மற்றும் காலக்கெடுவைப் பொறுத்தது.",
-        "view_table": "தரவு அட்டவணையைப் பார்க்கவும்",
-        "settings": "அமைப்புகள்",
-        "language": "மொழி",
-        "theme_color": "தீம் நிறம்",
-        "adjust_theme": "தீம் நிறத்தை மாற்றவும்",
-        "change_pin": "பின்னை மாற்றவும்",
-        "security_pin": "பாதுகாப்பு பின்",
-        "pin_info": "வெளியேறு -> மீட்டமைக்க 'பின்னை மறந்துவிட்டேன்' ஐப் பயன்படுத்தவும்.",
-        "water_tracker": "💧 நீர் கண்காணிப்பு",
-        "exercise_guide": "உடற்பயிற்சி வழிகாட்டி",
-        "add": "➕ சேர்",
-        "reset": "🔄 மீட்டமை",
-        "glasses": "டம்ளர்கள்",
-        "note": "குறிப்பு",
-        "consistency_msg": "நிலைத்தன்மை முக்கியமானது. வாரத்தில் 5 நாட்கள்."
-    },
-
-    "ml": {
-        "app_name": "ആർത്തവ ട്രായ്ക്കർ",
-        "welcome": "സ്വാഗതം",
-        "logout": "പുറത്തുകടക്കുക",
-        "tab_tracker": "📅 ട്രായ്ക്കർ",
-        "tab_analytics": "📊 വിശകലനം",
-        "tab_health": "🧘‍♀️ ആരോഗ്യം",
-        "tab_settings": "⚙️ ക്രമീകരണങ്ങൾ",
-        "log_period": "വിവരങ്ങൾ രേഖപ്പെടുത്തുക",
-        "start_date": "തുടങ്ങുന്ന തീയതി",
-        "end_date": "അവസാനിക്കുന്ന തീയതി",
-        "save_cycle": "സേവ് ചെയ്യുക",
-        "cycle_saved_msg": "വിവരങ്ങൾ രേഖപ്പെടുത്തി!",
-        "date_error": "അവസാന തീയതി തുടക്ക തീയതിക്ക് മുൻപാകരുത്.",
-        "predicted_next": "അടുത്ത പ്രതീക്ഷിക്കുന്ന തീയതി",
-        "cycle_analysis": "ചക്ര വിശകലനം",
-        "pcod_risk": "PCOD സാധ്യത",
-        "risk_low": "സാധ്യത കുറവ്",
-        "risk_medium": "മിതമായ സാധ്യത",
-        "risk_high": "സാധ്യത കൂടുതൽ",
-        "risk_desc": "ക്രമവും കാലയളവും അനുസരിച്ചുള്ളത്.",
-        "view_table": "വിവരങ്ങൾ കാണുക",
-        "settings": "ക്രമീകരണങ്ങൾ",
-        "language": "ഭാഷ",
-        "theme_color": "നിറം",
-        "adjust_theme": "നിറം മാറ്റുക",
-        "change_pin": "പിൻ മാറ്റുക",
-        "security_pin": "സുരക്ഷാ പിൻ",
-        "pin_info": "പുറത്തുകടക്കുക -> പിൻ മാറ്റാൻ 'Forgot PIN' ഉപയോഗിക്കുക.",
-        "water_tracker": "💧 വാട്ടർ ട്രായ്ക്കർ",
-        "exercise_guide": "വ്യായാമ സഹായി",
-        "add": "➕ ചേർക്കുക",
-        "reset": "🔄 പുനഃക്രമീകരിക്കുക",
-        "glasses": "ഗ്ലാസുകൾ",
-        "note": "ശ്രദ്ധിക്കുക",
-        "consistency_msg": "കൃത്യനിഷ്ഠ പ്രധാനം. ആഴ്ചയിൽ 5 ദിവസം."
-    }, 
-
-    "ur": {
-        "app_name": "ماہواری کا ٹریکر",
-        "welcome": "خوش آمدید",
-        "logout": "لاگ آؤٹ",
-        "tab_tracker": "📅 ٹریکر",
-        "tab_analytics": "📊 تجزیہ",
-        "tab_health": "🧘‍♀️ صحت",
-        "tab_settings": "⚙️ ترتیبات",
-        "log_period": "ماہواری درج کریں",
-        "start_date": "شروع کی تاریخ",
-        "end_date": "اختتامی تاریخ",
-        "save_cycle": "محفوظ کریں",
-        "cycle_saved_msg": "محفوظ کر لیا گیا!",
-        "date_error": "اختتامی تاریخ شروع کی تاریخ سے پہلے نہیں ہو سکتی۔",
-        "predicted_next": "اگلی متوقع ماہواری",
-        "cycle_analysis": "چکر کا تجزیہ",
-        "pcod_risk": "PCOD رسک کا اندازہ",
-        "risk_low": "کم خطرہ",
-        "risk_medium": "درمیانہ خطرہ",
-        "risk_high": "زیادہ خطرہ",
-        "risk_desc": "چکر کی باقاعدگی اور دورانیہ پر مبنی۔",
-        "view_table": "ڈیٹا ٹیبل دیکھیں",
-        "settings": "ترتیبات",
-        "language": "زبان",
-        "theme_color": "تھیم کا رنگ",
-        "adjust_theme": "تھیم کا رنگ تبدیل کریں",
-        "change_pin": "پن تبدیل کریں",
-        "security_pin": "سیکیورٹی پن",
-        "pin_info": "لاگ آؤٹ کریں -> پن ری سیٹ کرنے کے لیے 'بھول گئے پن' کا استعمال کریں۔",
-        "water_tracker": "💧 پانی کا ٹریکر",
-        "exercise_guide": "ورزش گائیڈ",
-        "add": "➕ شامل کریں",
-        "reset": "🔄 ری سیٹ کریں",
-        "glasses": "گلاس",
-        "note": "نوٹ",
-        "consistency_msg": "باقاعدگی اہم ہے۔ ہفتے میں 5 دن۔"
-    },
-   
-    "te": {
-        "app_name": "మహ్వారీ ట్రాకర్",
-        "welcome": "స్వాగతం",
-        "logout": "లాగ్ అవుట్",
-        "tab_tracker": "📅 ట్రాకర్",
-        "tab_analytics": "📊 విశ్లేషణ",
-        "tab_health": "🧘‍♀️ ఆరోగ్యం",
-        "tab_settings": "⚙️ సెట్టింగులు",
-        "log_period": "పీరియడ్ లాగ్ చేయండి",
-        "start_date": "ప్రారంభ తేదీ",
-        "end_date": "ముగింపు తేదీ",
-        "save_cycle": "సేవ్ చేయండి",
-        "cycle_saved_msg": "సైకిల్ సేవ్ చేయబడింది!",
-        "date_error": "ముగింపు తేదీ ప్రారంభ తేదీ కన్నా ముందు ఉండకూడదు.",
-        "predicted_next": "తదుపరి పీరియడ్ (అంచనా)",
-        "cycle_analysis": "సైకిల్ విశ్లేషణ",
-        "pcod_risk": "PCOD ప్రమాద అంచనా",
-        "risk_low": "తక్కువ ప్రమాదం",
-        "risk_medium": "మధ్యస్థ ప్రమాదం",
-        "risk_high": "అధిక ప్రమాదం",
-        "risk_desc": "సైకిల్ క్రమబద్ధత మరియు వ్యవధి ఆధారంగా.",
-        "view_table": "డేటా పట్టికను చూడండి",
-        "settings": "సెట్టింగులు",
-        "language": "భాష",
-        "theme_color": "థీమ్ రంగు",
-        "adjust_theme": "థీమ్ రంగును సర్దుబాటు చేయండి",
-        "change_pin": "పిన్ మార్చండి",
-        "security_pin": "సెక్యూరిటీ పిన్",
-        "pin_info": "లాగ్ అవుట్ -> రీసెట్ చేయడానికి 'ఫర్గాట్ పిన్' ఉపయోగించండి.",
-        "water_tracker": "💧 నీటి ట్రాకర్",
-        "exercise_guide": "వ్యాయామ గైడ్",
-        "add": "➕ జోడించు",
-        "reset": "🔄 రీసెట్",
-        "glasses": "గ్లాసెస్",
-        "note": "గమనిక",
-        "consistency_msg": "నిలకడ ముఖ్యం. వారానికి 5 రోజులు."
-    },
-
-    "bn": {
-        "app_name": "মাসিক ট্র্যাকার",
-        "welcome": "স্বাগতম",
-        "logout": "লগ আউট",
-        "tab_tracker": "📅 ট্র্যাকার",
-        "tab_analytics": "📊 বিশ্লেষণ",
-        "tab_health": "🧘‍♀️ স্বাস্থ্য",
-        "tab_settings": "⚙️ সেটিংস",
-        "log_period": "মাসিক রেকর্ড করুন",
-        "start_date": "শুরু তারিখ",
-        "end_date": "শেষ তারিখ",
-        "save_cycle": "সংরক্ষণ করুন",
-        "cycle_saved_msg": "তথ্য সংরক্ষিত হয়েছে!",
-        "date_error": "শেষ তারিখ শুরুর তারিখের আগে হতে পারে না।",
-        "predicted_next": "পরবর্তী সম্ভাব্য তারিখ",
-        "cycle_analysis": "চক্র বিশ্লেষণ",
-        "pcod_risk": "PCOD ঝুঁকির মূল্যায়ন",
-        "risk_low": "স্বল্প ঝুঁকি",
-        "risk_medium": "মাঝারি ঝুঁকি",
-        "risk_high": "উচ্চ ঝুঁকি",
-        "risk_desc": "চক্রের নিয়মিততা এবং স্থায়িত্বের উপর নির্ভর করে।",
-        "view_table": "ডেটা টেবিল দেখুন",
-        "settings": "সেটিংস",
-        "language": "ভাষা",
-        "theme_color": "থিম কালার",
-        "adjust_theme": "থিম পরিবর্তন করুন",
-        "change_pin": "পিন পরিবর্তন করুন",
-        "security_pin": "সুরক্ষা পিন",
-        "pin_info": "লগ আউট -> পিন রিসেট করতে 'পিন ভুলে গেছেন' ব্যবহার করুন।",
-        "water_tracker": "💧 জল ট্র্যাকার",
-        "exercise_guide": "ব্যায়াম নির্দেশিকা",
-        "add": "➕ যোগ করুন",
-        "reset": "🔄 রিসেট",
-        "glasses": "গ্লাস",
-        "note": "বিশেষ দ্রষ্টব্য",
-        "consistency_msg": "ধারাবাহিকতা জরুরি। সপ্তাহে ৫ দিন।"
-    },
-    
-    "or": {
-        "app_name": "ଋତୁଚକ୍ର ଟ୍ରାକର୍",
-        "welcome": "ସ୍ୱାଗତ",
-        "logout": "ଲଗ୍ ଆଉଟ୍",
-        "tab_tracker": "📅 ଟ୍ରାକର୍",
-        "tab_analytics": "📊 ବିଶ୍ଳେଷଣ",
-        "tab_health": "🧘‍♀️ ସ୍ୱାସ୍ଥ୍ୟ",
-        "tab_settings": "⚙️ ସେଟିଂସ",
-        "log_period": "ଋତୁଚକ୍ର ଲଗ୍ କରନ୍ତୁ",
-        "start_date": "ଆରମ୍ଭ ତାରିଖ",
-        "end_date": "ଶେଷ ତାରିଖ",
-        "save_cycle": "ସେଭ୍ କରନ୍ତୁ",
-        "cycle_saved_msg": "ଋତୁଚକ୍ର ସେଭ୍ ହୋଇଗଲା!",
-        "date_error": "ଶେଷ ତାରିଖ ଆରମ୍ଭ ତାରିଖ ପୂର୍ବରୁ ହୋଇପାରିବ ନାହିଁ।",
-        "predicted_next": "ପରବର୍ତ୍ତୀ ଅନୁମାନିତ ତାରିଖ",
-        "cycle_analysis": "ଋତୁଚକ୍ର ବିଶ୍ଳେଷଣ",
-        "pcod_risk": "PCOD ବିପଦ ମୂଲ୍ୟାଙ୍କନ",
-        "risk_low": "କମ୍ ବିପଦ",
-        "risk_medium": "ମଧ୍ୟମ ବିପଦ",
-        "risk_high": "ଅଧିକ ବିପଦ",
-        "risk_desc": "ଚକ୍ରର ନିୟମିତତା ଏବଂ ଅବଧି ଉପରେ ନିର୍ଭର କରେ।",
-        "view_table": "ଡାଟା ଟେବୁଲ୍ ଦେଖନ୍ତୁ",
-        "settings": "ସେଟିଂସ",
-        "language": "ଭାଷା",
-        "theme_color": "ଥିମ୍ ରଙ୍ଗ",
-        "adjust_theme": "ଥିମ୍ ରଙ୍ଗ ପରିବର୍ତ୍ତନ କରନ୍ତು",
-        "change_pin": "ପିନ୍ ବଦଳାନ୍ତୁ",
-        "security_pin": "ସୁରକ୍ଷା ପିନ୍",
-        "pin_info": "ଲଗ୍ ଆଉଟ୍ -> ପିନ୍ ରିସେଟ୍ ପାଇଁ 'Forgot PIN' ବ୍ୟବହାର କରନ୍ତୁ।",
-        "water_tracker": "💧 ଜଳ ଟ୍ରାକର୍",
-        "exercise_guide": "ବ୍ୟାୟାମ ମାର୍ଗଦର୍ଶିକା",
-        "add": "➕ ଯୋଗ କରନ୍ତୁ",
-        "reset": "🔄 ରିସେଟ୍",
-        "glasses": "ଗ୍ଲାସ୍",
-        "note": "ସୂଚନା",
-        "consistency_msg": "ନିରନ୍ତରତା ଜରୁରୀ। ସପ୍ତାହରେ ୫ ଦିନ।"
-    },
-
-    "kn": {
-        "app_name": "ಋತುಚಕ್ರ ಟ್ರ್ಯಾಕರ್",
-        "welcome": "ಸ್ವಾಗತ",
-        "logout": "ನಿರ್ಗಮಿಸು",
-        "tab_tracker": "📅 ಟ್ರ್ಯಾಕರ್",
-        "tab_analytics": "📊 ವಿಶ್ಲೇಷಣೆ",
-        "tab_health": "🧘‍♀️ ಆರೋಗ್ಯ",
-        "tab_settings": "⚙️ ಸೆಟ್ಟಿಂಗ್‌ಗಳು",
-        "log_period": "ಋತುಚಕ್ರ ದಾಖಲಿಸಿ",
-        "start_date": "ಪ್ರಾರಂಭ ದಿನಾಂಕ",
-        "end_date": "ಮುಕ್ತಾಯ ದಿನಾಂಕ",
-        "save_cycle": "ಉಳಿಸಿ",
-        "cycle_saved_msg": "ಋತುಚಕ್ರವನ್ನು ದಾಖಲಿಸಲಾಗಿದೆ!",
-        "date_error": "ಮುಕ್ತಾಯ ದಿನಾಂಕವು ಪ್ರಾರಂಭ ದಿನಾಂಕಕ್ಕಿಂತ ಮೊದಲು ಇರಬಾರದು.",
-        "predicted_next": "ಮುಂದಿನ ಅಂದಾಜು ದಿನಾಂಕ",
-        "cycle_analysis": "ಋತುಚಕ್ರ ವಿಶ್ಲೇಷಣೆ",
-        "pcod_risk": "PCOD ಅಪಾಯದ ಮೌಲ್ಯಮಾಪನ",
-        "risk_low": "ಕಡಿಮೆ ಅಪಾಯ",
-        "risk_medium": "ಮಧ್ಯಮ ಅಪಾಯ",
-        "risk_high": "ಹೆಚ್ಚಿನ ಅಪಾಯ",
-        "risk_desc": "ಚಕ್ರದ ಕ್ರಮಬದ್ಧತೆ ಮತ್ತು ಅವಧಿಯನ್ನು ಅವಲಂಬಿಸಿರುತ್ತದೆ.",
-        "view_table": "ಡೇಟಾ ಟೇಬಲ್ ವೀಕ್ಷಿಸಿ",
-        "settings": "ಸೆಟ್ಟಿಂಗ್‌ಗಳು",
-        "language": "ಭಾಷೆ",
-        "theme_color": "ಥೀಮ್ ಬಣ್ಣ",
-        "adjust_theme": "ಥೀಮ್ ಬಣ್ಣವನ್ನು ಹೊಂದಿಸಿ",
-        "change_pin": "ಪಿನ್ ಬದಲಾಯಿಸಿ",
-        "security_pin": "ಸುರಕ್ಷತಾ ಪಿನ್",
-        "pin_info": "ನಿರ್ಗಮಿಸಿ -> ಮರುಹೊಂದಿಸಲು 'ಪಿನ್ ಮರೆತಿದ್ದೇನೆ' ಬಳಸಿ.",
-        "water_tracker": "💧 ನೀರಿನ ಟ್ರ್ಯಾಕರ್",
-        "exercise_guide": "ವ್ಯಾಯಾಮ ಮಾರ್ಗದರ್ಶಿ",
-        "add": "➕ ಸೇರಿಸು",
-        "reset": "🔄 ಮರುಹೊಂದಿಸಿ",
-        "glasses": "ಲೋಟಗಳು",
-        "note": "ಸೂಚನೆ",
-        "consistency_msg": "ಸ್ಥಿರತೆ ಮುಖ್ಯ. ವಾರದಲ್ಲಿ 5 ದಿನಗಳು."
-    },
-
-    "mr": {
-        "app_name": "मासिक पाळी ट्रॅकर",
-        "welcome": "स्वागत आहे",
-        "logout": "लॉग आउट",
-        "tab_tracker": "📅 ट्रॅकर",
-        "tab_analytics": "📊 विश्लेषण",
-        "tab_health": "🧘‍♀️ आरोग्य",
-        "tab_settings": "⚙️ सेटिंग्ज",
-        "log_period": "माहिती नोंदवा",
-        "start_date": "सुरुवात तारीख",
-        "end_date": "शेवटची तारीख",
-        "save_cycle": "सेव्ह करा",
-        "cycle_saved_msg": "माहिती यशस्वीरित्या जतन केली!",
-        "date_error": "शेवटची तारीख सुरुवातीच्या तारखेच्या आधी नसावी.",
-        "predicted_next": "पुढील अंदाजित तारीख",
-        "cycle_analysis": "सायकल विश्लेषण",
-        "pcod_risk": "PCOD जोखीम मूल्यमापन",
-        "risk_low": "कमी जोखीम",
-        "risk_medium": "मध्यम जोखीम",
-        "risk_high": "उच्च जोखीम",
-        "risk_desc": "नियमितता आणि कालावधीवर आधारित.",
-        "view_table": "डेटा टेबल पहा",
-        "settings": "सेटिंग्ज",
-        "language": "भाषा",
-        "theme_color": "थीम रंग",
-        "adjust_theme": "थीम रंग बदला",
-        "change_pin": "पिन बदला",
-        "security_pin": "सुरक्षा पिन",
-        "pin_info": "लॉग आउट -> पिन रिसेट करण्यासाठी 'पिन विसरलात' वापरा.",
-        "water_tracker": "💧 पाणी ट्रॅकर",
-        "exercise_guide": "व्यायाम मार्गदर्शक",
-        "add": "➕ जोडा",
-        "reset": "🔄 रिसेट करा",
-        "glasses": "ग्लास",
-        "note": "टीप",
-        "consistency_msg": "सातत्य महत्त्वाचे आहे. आठवड्यातून ५ दिवस."
-    },
+"""
+UI strings, one JSON catalog per language in assets/i18n/.
+
+Catalogs are read on first use and kept in a small LRU cache, each merged
+over English so every key resolves. Check coverage after editing them:
+
+    python -m modules.build_translations
+"""
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+CATALOG_DIR = os.path.join("assets", "i18n")
+DEFAULT_LANG = "en"
+MAX_CACHED_CATALOGS = 4
+
+# Supported languages and their names in the picker; listing them here means
+# the settings page never has to open the catalogs
+LANG_NAMES = {
+    "en": "English",
+    "ta": "Tamil (தமிழ்)",
+    "ml": "Malayalam (മലയാളം)",
+    "ur": "Urdu (اردو)",
+    "te": "Telugu (తెలుగు)",
+    "bn": "Bengali (বাংলা)",
+    "or": "Odia (ଓଡ଼ିଆ)",
+    "kn": "Kannada (ಕನ್ನಡ)",
+    "mr": "Marathi (मराठी)",
+    "hi": "Hindi (हिंदी)",
+    "ne": "Nepali (नेपाली)"
+}
 
+def catalog_path(lang):
+    return os.path.join(CATALOG_DIR, f"{lang}.json")
 
-    "hi": {
-        "app_name": "माहवारी का ट्रेकर",
-        "welcome": "स्वागत हे",
-        "logout": "लॉग आउट",
-        "tab_tracker": "📅 ट्रैकर",
-        "tab_analytics": "📊 विश्लेषण",
-        "tab_health": "🧘‍♀️ स्वास्थ्य",
-        "tab_settings": "⚙️ सेटिंग्स",
-        "log_period": "माहवारी दर्ज करें",
-        "start_date": "आरंभ करने की तिथि",
-        "end_date": "अंतिम तिथि",
-        "save_cycle": "साइकिल सहेजें",
-        "cycle_saved_msg": "साइकिल लॉग की गई!",
-        "date_error": "अंतिम तिथि आरंभ तिथि से पहले नहीं हो सकती।",
-        "predicted_next": "अगली माहवारी (अनुमानित)",
-        "cycle_analysis": "साइकिल विश्लेषण",
-        "pcod_risk": "पीसीओडी जोखिम मूल्यांकन",
-        "risk_low": "कम जोखिम",
-        "risk_medium": "मध्यम जोखिम",
-        "risk_high": "उच्च जोखिम",
-        "risk_desc": "साइकिल की नियमितता और अवधि पर आधारित।",
-        "view_table": "डेटा तालिका देखें",
-        "settings": "सेटिंग्स",
-        "language": "भाषा",
-        "theme_color": "थीम का रंग",
-        "adjust_theme": "थीम का रंग समायोजित करें",
-        "change_pin": "पिन बदलें",
-        "security_pin": "सुरक्षा पिन",
-        "pin_info": "लॉग आउट करें -> पिन रीसेट करने के लिए 'फॉरगॉट पिन' का उपयोग करें।",
-        "water_tracker": "💧 जल का सेवन",
-        "exercise_guide": "व्यायाम गाइड",
-        "add": "➕ जोड़ें",
-        "reset": "🔄 रीसेट",
-        "glasses": "ग्लास",
-        "note": "नोट",
-        "consistency_msg": "नियमितता महत्वपूर्ण है। सप्ताह में 5 दिन।"
-    },
+def read_catalog(lang):
+    with open(catalog_path(lang), encoding="utf-8") as f:
+        return json.load(f)
 
-    "ne": {
-        "app_name": "महिनावारी ट्र्याकर",
-        "welcome": "स्वागत छ",
-        "logout": "लग आउट",
-        "tab_tracker": "📅 ट्र्याकर",
-        "tab_analytics": "📊 विश्लेषण",
-        "tab_health": "🧘‍♀️ स्वास्थ्य",
-        "tab_settings": "⚙️ सेटिङहरू",
-        "log_period": "महिनावारी दर्ता गर्नुहोस्",
-        "start_date": "सुरु हुने मिति",
-        "end_date": "अन्त्य हुने मिति",
-        "save_cycle": "सेभ गर्नुहोस्",
-        "cycle_saved_msg": "दर्ता सफल भयो!",
-        "date_error": "अन्त्य मिति सुरु मिति भन्दा पहिले हुन सक्दैन।",
-        "predicted_next": "अर्को अनुमानित मिति",
-        "cycle_analysis": "महिनावारी चक्र विश्लेषण",
-        "pcod_risk": "PCOD जोखिम मूल्याङ्कन",
-        "risk_low": "कम जोखिम",
-        "risk_medium": "मध्यम जोखिम",
-        "risk_high": "उच्च जोखिम",
-        "risk_desc": "नियमितता र अवधिको आधारमा।",
-        "view_table": "डाटा तालिका हेर्नुहोस्",
-        "settings": "सेटिङहरू",
-        "language": "भाषा",
-        "theme_color": "रंग",
-        "adjust_theme": "थीम रंग परिवर्तन गर्नुहोस्",
-        "change_pin": "पिन परिवर्तन गर्नुहोस्",
-        "security_pin": "सुरक्षा पिन",
-        "pin_info": "लग आउट -> पिन रिसेट गर्न 'Forgot PIN' प्रयोग गर्नुहोस्।",
-        "water_tracker": "💧 पानी ट्र्याकर",
-        "exercise_guide": "व्यायाम निर्देशिका",
-        "add": "➕ थप्नुहोस्",
-        "reset": "🔄 रिसेट",
-        "glasses": "ग्लास",
-        "note": "नोट",
-        "consistency_msg": "निरन्तरता महत्त्वपूर्ण छ। हप्तामा ५ दिन।"
-    },
+def get_translations(lang):
+    # Unknown codes fall back to English before they reach the cache
+    return _load(lang if lang in LANG_NAMES else DEFAULT_LANG)
 
-}
-    
\ No newline at end of file
+@lru_cache(maxsize=MAX_CACHED_CATALOGS)
+def _load(lang):
+    strings = read_catalog(DEFAULT_LANG) if lang == DEFAULT_LANG else {**_load(DEFAULT_LANG), **read_catalog(lang)}
+    # Shared by every session using this language
+    return MappingProxyType(strings)
@@ -0,0 +1,35 @@
+import re
+
+# User IDs look like Name-NNN (e.g. Manoj-005). Each first-name prefix has
+# its own counter in user_id_counters, bumped with a single upsert inside the
+# caller's transaction, so allocation is O(1) and two concurrent sign-ups
+# can never be handed the same number.
+
+USER_ID_PATTERN = re.compile(r"^(.+)-(\d+)$")
+
+def user_id_prefix(name):
+    return name.split()[0].capitalize() if name and name.split() else "User"
+
+def next_user_id(conn, name):
+    prefix = user_id_prefix(name)
+    conn.execute(
+        "INSERT INTO user_id_counters (prefix, next_value) VALUES (?, 2) "
+        "ON CONFLICT(prefix) DO UPDATE SET next_value = next_value + 1",
+        (prefix,)
+    )
+    # The upsert holds the write lock until commit, so this read is ours
+    number = conn.execute("SELECT next_value - 1 FROM user_id_counters WHERE prefix = ?", (prefix,)).fetchone()[0]
+    return f"{prefix}-{number:03d}"
+
+def rebuild_counters(conn):
+    # Seed counters past every existing Name-NNN id
+    highest = {}
+    for (user_id,) in conn.execute("SELECT user_id FROM users WHERE user_id IS NOT NULL"):
+        match = USER_ID_PATTERN.match(user_id)
+        if match:
+            prefix, number = match.group(1), int(match.group(2))
+            highest[prefix] = max(highest.get(prefix, 0), number)
+    conn.executemany(
+        "INSERT OR REPLACE INTO user_id_counters (prefix, next_value) VALUES (?, ?)",
+        ((prefix, number + 1) for prefix, number in highest.items())
+    )
@@ -0,0 +1,90 @@
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+
+from .database_setup import transaction
+
+# Write-behind log of daily water intake. Clicks only update an in-memory
+# map of (username, day) -> glasses; a background thread upserts whatever
+# changed every FLUSH_INTERVAL seconds, so a burst of clicks becomes one
+# row write. Pending values are also flushed on logout and at exit.
+
+FLUSH_INTERVAL = 5 # seconds
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock() # serialises flush(); never taken while holding _lock
+_pending = {} # (username, day) -> glasses
+_flusher = None
+_counters = {"updates": 0, "flushes": 0, "rows_written": 0, "flush_errors": 0}
+
+def record_glasses(username, day, glasses):
+    """Sets username's glasses for day (a date); persisted on the next flush."""
+    global _flusher
+    with _lock:
+        _pending[(username, str(day))] = glasses
+        _counters["updates"] += 1
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name="water-log-flush", daemon=True)
+            _flusher.start()
+
+def get_glasses(username, day):
+    with _lock:
+        pending = _pending.get((username, str(day)))
+    if pending is not None:
+        return pending
+    with transaction() as conn:
+        row = conn.execute("SELECT glasses FROM water_intake WHERE username = ? AND day = ?", (username, str(day))).fetchone()
+    return row[0] if row else 0
+
+def flush(username=None):
+    """Writes pending values (only username's, if given). Returns the number of rows written."""
+    # One flush at a time, so two snapshots can't commit out of order and
+    # put an older count back
+    with _flush_lock:
+        with _lock:
+            batch = {key: value for key, value in _pending.items() if username is None or key[0] == username}
+        if not batch:
+            return 0
+
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            with transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO water_intake (username, day, glasses, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (username, day) DO UPDATE SET glasses = excluded.glasses, updated_at = excluded.updated_at",
+                    [(user, day, glasses, updated_at) for (user, day), glasses in batch.items()]
+                )
+        except Exception:
+            # Entries are still pending; the next flush retries them
+            with _lock:
+                _counters["flush_errors"] += 1
+            logger.exception("water intake flush failed; %d rows kept for retry", len(batch))
+            return 0
+
+        with _lock:
+            # Entries stay pending (and get_glasses keeps serving them) until
+            # written; drop only the ones no click has changed meanwhile
+            for key, value in batch.items():
+                if _pending.get(key) == value:
+                    del _pending[key]
+            _counters["flushes"] += 1
+            _counters["rows_written"] += len(batch)
+        return len(batch)
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush()
+
+atexit.register(flush)
+
+def get_water_log_stats():
+    with _lock:
+        stats = dict(_counters, pending=len(_pending))
+    # Clicks absorbed per row written
+    stats["coalescing"] = stats["updates"] / stats["rows_written"] if stats["rows_written"] else 0.0
+    return stats